@@ -0,0 +1,82 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+"""Compare Sphinx builds of a Swift project with different numbers of processes.
+
+Usage: python benchmarks/bench_build.py [--files N] [--documents N] [--jobs 1 8]
+
+A synthetic corpus (see corpus.py) is generated together with a Sphinx
+project whose documents hold `autoswift` directives for its types. The
+project is built from scratch once per `--jobs` value and the wall time is
+reported. Reading is only parallel with more than 5 documents and the
+speedup is bounded by the number of CPUs of the machine.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate
+from sphinx.application import Sphinx
+
+
+def make_project(directory, files, documents, directives):
+    source = os.path.join(directory, 'src')
+    generate(source, files=files)
+    docs = os.path.join(directory, 'docs')
+    os.makedirs(docs)
+    with open(os.path.join(docs, 'conf.py'), 'w') as fp:
+        fp.write("extensions = ['swift_domain']\n")
+        fp.write("master_doc = 'index'\n")
+        fp.write("swift_search_path = [%r]\n" % source)
+        fp.write("swift_index_cache = False\n")
+    with open(os.path.join(docs, 'index.rst'), 'w') as fp:
+        fp.write('Benchmark\n=========\n\n.. toctree::\n\n')
+        fp.write(''.join('   doc%d\n' % d for d in range(documents)))
+
+    # every file has at least one type, spread the directives over the documents
+    per_document = max(directives // documents, 1)
+    for d in range(documents):
+        with open(os.path.join(docs, 'doc%d.rst' % d), 'w') as fp:
+            fp.write('Document %d\n==========\n\n' % d)
+            for i in range(per_document):
+                file = (d * per_document + i) % files
+                fp.write('.. autoswift:: Type%d_0\n   :members:\n\n' % file)
+    return docs
+
+
+def build(docs, outdir, jobs):
+    start = time.perf_counter()
+    # the indexer reports every file on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = Sphinx(docs, docs, os.path.join(outdir, 'html'), os.path.join(outdir, 'doctrees'), 'html',
+                     status=io.StringIO(), warning=io.StringIO(), freshenv=True, parallel=jobs)
+        app.build()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel Sphinx builds.')
+    parser.add_argument('--files', type=int, default=1500, help='files of the synthetic corpus')
+    parser.add_argument('--documents', type=int, default=32)
+    parser.add_argument('--directives', type=int, default=320)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        docs = make_project(directory, args.files, args.documents, args.directives)
+        print('%d CPUs, %d files, %d documents, %d directives' % (
+            os.cpu_count(), args.files, args.documents, args.directives))
+        for jobs in args.jobs:
+            elapsed = build(docs, os.path.join(directory, 'build-%d' % jobs), jobs)
+            print('-j %d: %.2fs' % (jobs, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+"""Measure how many lines per second the Swift indexer parses.
+
+Usage: python benchmarks/bench_index.py [directory] [--files N] [--repeat N] [--jobs N]
+
+Without a directory a synthetic corpus (see corpus.py) is generated in a
+temporary directory. The index is built without a cache, the best of
+`--repeat` runs is reported. Run it on different revisions of the tree to
+compare parser versions, e.g. the regex cascade before keyword dispatch:
+
+    git worktree add /tmp/cascade 07c2057
+    cp benchmarks/*.py /tmp/cascade/ && python /tmp/cascade/bench_index.py
+"""
+
+import argparse
+import contextlib
+import inspect
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate
+from swift_domain.indexer import SwiftFileIndex
+
+
+def count_lines(directory):
+    total = 0
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.swift'):
+                with open(os.path.join(root, name), encoding='utf-8') as fp:
+                    total += sum(1 for _ in fp)
+    return total
+
+
+def build_index(directory, jobs):
+    # older revisions know neither `jobs` nor `progress` and print every file
+    accepted = inspect.signature(SwiftFileIndex).parameters
+    kwargs = {}
+    if 'jobs' in accepted:
+        kwargs['jobs'] = jobs
+    elif jobs > 1:
+        raise SystemExit('this revision does not parse in parallel')
+    if 'progress' in accepted:
+        kwargs['progress'] = lambda file: None
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SwiftFileIndex([directory], **kwargs)
+
+
+def run(directory, repeat, jobs):
+    lines = count_lines(directory)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build_index(directory, jobs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('%d lines, best of %d: %.2fs, %.1fk lines/s' % (lines, repeat, best, lines / best / 1000.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Swift indexer.')
+    parser.add_argument('directory', nargs='?', help='Swift sources, a synthetic corpus if not given')
+    parser.add_argument('--files', type=int, default=1500, help='files of the synthetic corpus')
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.directory:
+        run(args.directory, args.repeat, args.jobs)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        generate(directory, files=args.files)
+        run(directory, args.repeat, args.jobs)
+
+
+if __name__ == '__main__':
+    main()
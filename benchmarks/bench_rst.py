@@ -0,0 +1,72 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+"""Measure how many doc comment lines per second are converted to reStructuredText.
+
+Usage: python benchmarks/bench_rst.py [directory] [--files N] [--repeat N]
+
+The doc comments of all symbols and members of the Swift files in
+`directory`, or of a synthetic corpus (see corpus.py), are collected first,
+only their conversion with `doc_block_to_rst` is timed. The best of
+`--repeat` runs is reported.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate
+from swift_domain.indexer import SwiftFileIndex, doc_block_to_rst
+
+
+def collect(items, blocks):
+    for item in items:
+        if item['documented']:
+            blocks.append(list(item['docstring']))
+        if 'members' in item:
+            collect(item['members'].index, blocks)
+            collect(item['children'], blocks)
+    return blocks
+
+
+def run(directory, repeat):
+    with contextlib.redirect_stdout(io.StringIO()):
+        index = SwiftFileIndex([directory])
+    blocks = collect(index.index, [])
+    lines = sum(len(block) for block in blocks)
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for block in blocks:
+            for _line in doc_block_to_rst(block):
+                pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print('%d blocks, %d lines, best of %d: %.2fs, %.1fk lines/s' % (
+        len(blocks), lines, repeat, best, lines / best / 1000.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the doc comment conversion.')
+    parser.add_argument('directory', nargs='?', help='Swift sources, a synthetic corpus if not given')
+    parser.add_argument('--files', type=int, default=500, help='files of the synthetic corpus')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.directory:
+        run(args.directory, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        generate(directory, files=args.files)
+        run(directory, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
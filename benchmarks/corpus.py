@@ -0,0 +1,141 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+"""Generate a synthetic Swift corpus for the benchmarks.
+
+Usage: python benchmarks/corpus.py <directory> [--files N] [--types N] [--seed N]
+
+Every file holds documented classes, structs, enums, protocols and
+extensions with functions, initializers, properties and enum cases, spread
+over a few nested directories. The output only depends on the arguments.
+"""
+
+import argparse
+import os
+import random
+
+
+CALLOUTS = ['Returns', 'Throws', 'Note', 'Warning', 'Complexity', 'Precondition', 'SeeAlso', 'Since']
+SCOPES = ['', 'public ', 'private ', 'internal ', 'open ']
+TYPES = ['Int', 'String', 'Bool', 'Double', '[String]', '[String: Int]', 'Int?', 'Data']
+
+
+def doc_comment(rnd, indent, params=()):
+    lines = []
+    style = rnd.randrange(3)
+    text = ['Summary of the `%s` declaration.' % rnd.choice(TYPES),
+            '',
+            'A longer description with a \\ backslash and `code`.']
+    if rnd.randrange(4) == 0:
+        text += ['', '```', 'let value = compute(1)', '```']
+    if params:
+        if rnd.randrange(2):
+            text += ['', '- Parameters:'] + ['  - %s: the %s' % (p, p) for p in params]
+        else:
+            text += ['- Parameter %s: the %s' % (p, p) for p in params]
+    text += ['- %s: something' % rnd.choice(CALLOUTS)]
+
+    if style == 0:
+        lines.append(indent + '/**')
+        lines += [indent + ' ' + l for l in text]
+        lines.append(indent + ' */')
+    else:
+        lines += [indent + '/// ' + l for l in text]
+    return lines
+
+
+def member(rnd, indent, name, kind):
+    scope = rnd.choice(SCOPES)
+    lines = []
+    if kind == 'func':
+        params = ['arg%d' % i for i in range(rnd.randrange(4))]
+        if rnd.randrange(3):
+            lines += doc_comment(rnd, indent, params)
+        signature = ', '.join('%s: %s' % (p, rnd.choice(TYPES)) for p in params)
+        static = rnd.choice(['', '', 'static ', 'mutating '])
+        lines.append('%s%s%sfunc %s(%s) -> %s {' % (indent, scope, static, name, signature, rnd.choice(TYPES)))
+        for i in range(rnd.randrange(2, 12)):
+            lines.append('%s    let local%d = "text { with braces }" // comment {' % (indent, i))
+        lines.append(indent + '    return nil')
+        lines.append(indent + '}')
+    elif kind == 'init':
+        lines += doc_comment(rnd, indent, ['value'])
+        lines.append('%s%sinit(value: %s) {' % (indent, scope, rnd.choice(TYPES)))
+        lines.append(indent + '    self.value = value')
+        lines.append(indent + '}')
+    elif kind == 'var':
+        if rnd.randrange(2):
+            lines += doc_comment(rnd, indent)
+        keyword = rnd.choice(['var', 'let'])
+        lines.append('%s%s%s %s: %s' % (indent, scope, keyword, name, rnd.choice(TYPES)))
+    elif kind == 'computed':
+        lines += doc_comment(rnd, indent)
+        lines.append('%s%svar %s: %s {' % (indent, scope, name, rnd.choice(TYPES)))
+        lines.append(indent + '    return 0')
+        lines.append(indent + '}')
+    else:
+        # plain comments and code in between declarations
+        lines.append(indent + '/* plain comment */')
+        lines.append(indent + '// line comment')
+    return lines
+
+
+def type_decl(rnd, name, depth=0):
+    indent = '    ' * depth
+    kind = rnd.choice(['class', 'struct', 'enum', 'protocol', 'extension'])
+    lines = doc_comment(rnd, indent)
+    if kind == 'extension':
+        lines.append('%sextension %s: CustomStringConvertible where Element: Equatable {' % (indent, name))
+    else:
+        lines.append('%s%s%s %s: Equatable {' % (indent, rnd.choice(SCOPES), kind, name))
+
+    inner = indent + '    '
+    if kind == 'enum':
+        for i in range(rnd.randrange(2, 10)):
+            if rnd.randrange(2):
+                lines += doc_comment(rnd, inner)
+            lines.append('%scase value%d(Int, String)' % (inner, i))
+    elif kind == 'protocol':
+        for i in range(rnd.randrange(2, 8)):
+            lines += doc_comment(rnd, inner)
+            lines.append('%svar property%d: Int { get set }' % (inner, i))
+            lines.append('%sfunc method%d(value: Int) -> Bool' % (inner, i))
+    else:
+        for i in range(rnd.randrange(3, 16)):
+            kind = rnd.choice(['func', 'func', 'init', 'var', 'computed', 'code'])
+            lines += member(rnd, inner, 'member%d' % i, kind)
+        if depth < 2 and rnd.randrange(4) == 0:
+            lines += type_decl(rnd, name + 'Inner', depth + 1)
+    lines.append(indent + '}')
+    lines.append('')
+    return lines
+
+
+def generate(directory, files=1500, types=12, seed=0):
+    """Write the corpus to `directory`, return the number of lines written."""
+    rnd = random.Random(seed)
+    total = 0
+    for index in range(files):
+        subdir = os.path.join(directory, 'Module%d' % (index % 10), 'Group%d' % (index % 7))
+        os.makedirs(subdir, exist_ok=True)
+        lines = ['import Foundation', '']
+        for t in range(types):
+            lines += type_decl(rnd, 'Type%d_%d' % (index, t))
+        with open(os.path.join(subdir, 'File%d.swift' % index), 'w', encoding='utf-8') as fp:
+            fp.write('\n'.join(lines) + '\n')
+        total += len(lines)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Swift corpus.')
+    parser.add_argument('directory')
+    parser.add_argument('--files', type=int, default=1500)
+    parser.add_argument('--types', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    total = generate(args.directory, args.files, args.types, args.seed)
+    print('%d files, %d lines written to %s' % (args.files, total, args.directory))
+
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,9 @@ setup(
             'theme.conf',
             '*.html',
             'static/css/*.css'
+        ],
+        'swift_domain': [
+            'external_symbols.txt'
         ]
     },
     entry_points={
@@ -44,7 +47,6 @@ setup(
         'Topic :: Software Development :: Documentation',
     ],
     install_requires=[
-        'fuzzywuzzy',
         'sphinx'
     ]
 )
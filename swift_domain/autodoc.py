@@ -1,15 +1,142 @@
 # Copyright 2016 by Johannes Schriewer
 # BSD license, see LICENSE for details
 
-from sphinx.ext.autodoc import Documenter, bool_option, members_option, members_set_option
-from swift_domain.indexer import SwiftFileIndex, SwiftObjectIndex
+import multiprocessing
+import os
+import pickle
+import re
 
-file_index = None
+from sphinx.ext.autodoc import ALL, Documenter, bool_option, members_option
+from swift_domain.cache import RstCache
+from swift_domain.indexer import PARSER_VERSION, RST_VERSION, SwiftFileIndex, SwiftObjectIndex
+
+
+def members_set_option(arg):
+    """Set of the comma separated values of an option, `ALL` if it has none.
+
+    Sphinx deprecated its own version in 4.5 and removed it in 5.0.
+    """
+    if not arg:
+        return ALL
+    return set(x.strip() for x in arg.split(','))
+
+
+class SwiftIndexHandle(object):
+    """Reference to the Swift index of the current build kept in the environment.
+
+    Only the path of the index snapshot is pickled with the environment.
+    Parallel readers inherit the index from the main process when forked and
+    load the snapshot otherwise, the Swift files are never parsed again. The
+    snapshot is only written if workers are not forked.
+    """
+
+    def __init__(self, index, path=None):
+        self.index = index
+        self.path = path
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.index = None
+
+    def load(self):
+        if self.index is None:
+            if self.path is None:
+                raise RuntimeError('the Swift index was not built in this process')
+            with open(self.path, 'rb') as fp:
+                self.index = pickle.load(fp)
+        return self.index
 
 
 def build_index(app):
-    global file_index
-    file_index = SwiftFileIndex(app.config.swift_search_path)
+    cache_path = app.config.swift_index_cache
+    if cache_path is None:
+        cache_path = os.path.join(app.doctreedir, 'swift-index.cache')
+    file_index = SwiftFileIndex(
+        app.config.swift_search_path,
+        cache_path=cache_path or None,
+        jobs=app.config.swift_index_jobs,
+        include_patterns=app.config.swift_include_patterns,
+        exclude_patterns=app.config.swift_exclude_patterns
+    )
+
+    # forked parallel readers inherit the index, only spawned ones need a snapshot
+    snapshot = None
+    start_method = multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_context().get_start_method()
+    if app.parallel > 1 and start_method != 'fork':
+        snapshot = os.path.join(app.doctreedir, 'swift-index.pickle')
+        if not os.path.isdir(app.doctreedir):
+            os.makedirs(app.doctreedir)
+        tmp = snapshot + '.tmp'
+        with open(tmp, 'wb') as fp:
+            pickle.dump(file_index, fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snapshot)
+    app.env.swift_file_index = SwiftIndexHandle(file_index, snapshot)
+
+    # generated RST is cached next to the index, if that is cached at all
+    rst_cache = None
+    if cache_path:
+        rst_cache = RstCache(os.path.splitext(cache_path)[0] + '-rst.cache', (PARSER_VERSION, RST_VERSION))
+    app.env.swift_rst_cache = rst_cache
+
+
+def purge_rst_cache(app, env, docname):
+    if getattr(env, 'swift_rst_cache', None) is not None:
+        env.swift_rst_cache.clear_doc(docname)
+
+
+def merge_rst_cache(app, env, docnames, other):
+    if getattr(env, 'swift_rst_cache', None) is not None:
+        env.swift_rst_cache.merge(docnames, other.swift_rst_cache)
+
+
+def save_rst_cache(app, env):
+    if getattr(env, 'swift_rst_cache', None) is not None:
+        env.swift_rst_cache.save(env.all_docs)
+
+
+class MemberFilter(object):
+    """Member selection options of one autoswift directive.
+
+    The raw member patterns are compiled once into a single alternation that
+    is searched once per member instead of testing each pattern separately.
+    """
+
+    def __init__(self, options):
+        self.names = options.members if isinstance(options.members, list) else []
+        self.raw = self.compile(options.raw_members)
+        self.exclude = options.exclude_members if isinstance(options.exclude_members, set) else set()
+        self.only_names = options.only_with_members
+        self.only_raw = self.compile(options.only_with_raw_members)
+
+    @staticmethod
+    def compile(patterns):
+        if not isinstance(patterns, set):
+            return None
+        # `/` stands for `,` which separates the option's values
+        patterns = sorted((x.replace("/", ",") for x in patterns), key=len, reverse=True)
+        return re.compile('|'.join(re.escape(x) for x in patterns))
+
+    def selects_type(self, item):
+        """Whether the `only-with-...` options allow documenting `item`."""
+        members = item['members'].index
+        if self.only_names and not any(x['name'] in self.only_names for x in members):
+            return False
+        if self.only_raw is not None and not any(self.only_raw.search(x['raw']) for x in members):
+            return False
+        return True
+
+    def selects_member(self, member):
+        """Whether `member` is requested by the members options and not excluded."""
+        if member['name'] in self.exclude:
+            return False
+        if not self.names and self.raw is None:
+            return True
+        if member['name'] in self.names:
+            return True
+        return self.raw is not None and self.raw.search(member['raw']) is not None
 
 
 class SwiftAutoDocumenter(Documenter):
@@ -38,10 +165,17 @@ class SwiftAutoDocumenter(Documenter):
         self.append_at_end = []
 
     def generate(self, **kwargs):
-        global file_index
+        file_index = self.env.swift_file_index.load()
+        self.member_filter = MemberFilter(self.options)
+
+        # documents are read again when a Swift file they document changes
+        dependencies = getattr(self.directive, 'record_dependencies', None)
+        if dependencies is None:
+            dependencies = self.directive.filename_set
 
         emit_warning = True
         for index in file_index.find(self.name):
+            dependencies.add(index['file'])
             self.document(index)
             emit_warning = False
 
@@ -56,21 +190,20 @@ class SwiftAutoDocumenter(Documenter):
                 self.env.docname,
                 err)
 
-    def document(self, item, indent=''):
-        member_list = self.options.members if isinstance(self.options.members, list) else []
-        raw_member_list = set([x.replace("/",",") for x in self.options.raw_members]) if isinstance(self.options.raw_members, set) else []
-
-        if self.options.only_with_members:
-            if len(list([x for x in item['members'].index if x['name'] in self.options.only_with_members])) <= 0:
-                return
-
-        if self.options.only_with_raw_members:
-            contains = False
-            for member in item['members'].index:
-                if len(list([x for x in [x.replace("/",",") for x in self.options.only_with_raw_members] if x in member['raw']]))>0:
-                    contains = True
-            if not contains: return
+    def rst(self, index, item, **options):
+        """Lines of `index.documentation`, from the RST cache if there is one."""
+        cache = self.env.swift_rst_cache
+        if cache is None:
+            return index.documentation(item, **options)
+        return cache.lines(
+            self.env.docname,
+            index.documentation_key(item, **options),
+            lambda: index.documentation(item, **options)
+        )
 
+    def document(self, item, indent=''):
+        if not self.member_filter.selects_type(item):
+            return
 
         # Don't document everything if a specific type was requested
         if self.objtype != 'swift':
@@ -78,7 +211,8 @@ class SwiftAutoDocumenter(Documenter):
                 return
 
 
-        doc = SwiftFileIndex.documentation(
+        doc = self.rst(
+            SwiftFileIndex,
             item,
             indent=self.content_indent,
             location=('file-location' in self.options),
@@ -93,24 +227,16 @@ class SwiftAutoDocumenter(Documenter):
         if 'members' not in self.options and 'raw-members' not in self.options:
             return
 
-        exclude_list = self.options.exclude_members if isinstance(self.options.exclude_members, set) else []
         for member in item['members'].index:
-            add = False
-            if (not member_list and not raw_member_list):
-                add = True
-            if member['name'] in member_list:
-                add = True
-            if len(list([x for x in raw_member_list if x in member['raw']]))>0:
-                add = True
-            if member['name'] in exclude_list:
-                add = False
-            if 'undoc-members' in self.options and len(member['docstring']) == 0:
+            add = self.member_filter.selects_member(member)
+            if 'undoc-members' in self.options and not member['documented']:
                 add = False
             if 'private-members' not in self.options and member['scope'] != 'public':
                 add = False
             if add:
                 loc = item['file'] if 'file-location' in self.options else None
-                doc = SwiftObjectIndex.documentation(
+                doc = self.rst(
+                    SwiftObjectIndex,
                     member,
                     indent=self.content_indent,
                     location=loc,
@@ -2,9 +2,14 @@
 # BSD license, see LICENSE for details
 
 import argparse
+import io
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
 
-from swift_domain.indexer import SwiftFileIndex, SwiftObjectIndex
+from swift_domain.indexer import SwiftFileIndex, SwiftObjectIndex, default_exclude_patterns
 
 parser = argparse.ArgumentParser(description='Bootstrap ReStructured Text documentation for Swift code.')
 parser.add_argument(
@@ -91,12 +96,126 @@ parser.add_argument(
     required=False,
     default=False
 )
+parser.add_argument(
+    '--cache',
+    dest='cache',
+    metavar='file',
+    type=str,
+    required=False,
+    default=None,
+    help='Cache parsed Swift files in this file, only changed files are parsed again'
+)
+parser.add_argument(
+    '--jobs',
+    dest='jobs',
+    metavar='N',
+    type=int,
+    required=False,
+    default=1,
+    help='Number of processes to parse Swift files and render documentation with'
+)
+parser.add_argument(
+    '--exclude-path',
+    dest='exclude_paths',
+    metavar='pattern',
+    action='append',
+    required=False,
+    default=None,
+    help='Glob pattern for files and directories to skip, may be given multiple times (default: {})'.format(
+        ' '.join(default_exclude_patterns))
+)
+
+
+class Progress(object):
+    """Prints the number of files done and the throughput at most once per `interval` seconds."""
+
+    def __init__(self, action, total=None, interval=1.0):
+        self.action = action
+        self.total = total
+        self.interval = interval
+        self.count = 0
+        self.start = self.last = time.time()
+
+    def __call__(self, *args):
+        self.count += 1
+        now = time.time()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.report(now)
 
+    def report(self, now):
+        done = str(self.count) if self.total is None else '{}/{}'.format(self.count, self.total)
+        elapsed = now - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0
+        print('{} {} files ({:.0f} files/s)'.format(self.action, done, rate))
 
-def main():
-    args = parser.parse_args()
+    def finish(self):
+        if self.count:
+            self.report(time.time())
+
+
+# files, options and paths shared by all render calls of a process, see `init_render`
+render_state = None
+
+
+def init_render(*state):
+    """Set the state for `render_file`, the index is inherited by forked workers."""
+    global render_state
+    render_state = state
+
+
+def render_file(index):
+    """Documentation for the `index`th `(file, top level symbols)` item of `by_file`."""
+    files, args, exclusion_list, source_path = render_state
+    file, members = files[index]
+    fp = io.StringIO()
+    heading = 'Documentation for {}'.format(os.path.relpath(file, source_path))
+    fp.write(heading + '\n')
+    fp.write(('=' * len(heading)) + '\n\n\n')
+    if args.autodocumenter:
+        auto_document(members, args, exclusion_list, fp)
+    else:
+        document(members, args, exclusion_list, file, fp, '')
+    return fp.getvalue()
+
+
+def write_files(queue, errors, progress):
+    """Write `(filename, content)` pairs from `queue` until `None` is received.
+
+    After the first error the remaining items are only drained, so producers
+    blocked on the bounded queue do not hang.
+    """
+    while True:
+        item = queue.get()
+        if item is None:
+            return
+        if errors:
+            continue
+        try:
+            destfile, content = item
+            try:
+                os.makedirs(os.path.dirname(destfile))
+            except OSError:
+                pass
+            with open(destfile, "w") as fp:
+                fp.write(content)
+            progress()
+        except Exception as e:
+            errors.append(e)
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
     source_path = os.path.abspath(args.source_path)
-    file_index = SwiftFileIndex([source_path])
+    progress = Progress('Indexed')
+    file_index = SwiftFileIndex(
+        [source_path],
+        cache_path=args.cache,
+        jobs=args.jobs,
+        exclude_patterns=args.exclude_paths,
+        progress=progress
+    )
+    progress.finish()
 
     try:
         os.makedirs(args.documentation_path)
@@ -104,7 +223,8 @@ def main():
         pass
 
     # check for overwrite
-    for file, members in list(file_index.by_file().items()):
+    files = list(file_index.by_file().items())
+    for file, members in files:
         destfile = get_dest_file(file, args.source_path, args.documentation_path)
         if os.path.exists(destfile) and not args.overwrite:
             print(("""ERROR: {} already exists, to overwrite existing
@@ -115,21 +235,34 @@ def main():
     if args.exclusion_list:
         exclusion_list = open(args.exclusion_list, 'r').readlines()
 
-    for file, members in list(file_index.by_file().items()):
-        destfile = get_dest_file(file, args.source_path, args.documentation_path)
-        print(("Writing documentation for '{}'...".format(os.path.relpath(file, source_path))))
-        try:
-            os.makedirs(os.path.dirname(destfile))
-        except:
-            pass
-        with open(destfile, "w") as fp:
-            heading = 'Documentation for {}'.format(os.path.relpath(file, source_path))
-            fp.write(heading + '\n')
-            fp.write(('=' * len(heading)) + '\n\n\n')
-            if args.autodocumenter:
-                auto_document(members, args, exclusion_list, fp)
-            else:
-                document(members, args, exclusion_list, file, fp, '')
+    # render in worker processes, write in a thread fed through a bounded queue
+    state = (files, args, exclusion_list, source_path)
+    queue = Queue(maxsize=max(args.jobs, 1) * 16)
+    errors = []
+    progress = Progress('Wrote', total=len(files))
+    writer = threading.Thread(target=write_files, args=(queue, errors, progress))
+    writer.start()
+    try:
+        if args.jobs > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_render, initargs=state) as executor:
+                contents = executor.map(render_file, range(len(files)), chunksize=8)
+                for (file, _), content in zip(files, contents):
+                    if errors:
+                        break
+                    queue.put((get_dest_file(file, args.source_path, args.documentation_path), content))
+        else:
+            init_render(*state)
+            for index, (file, _) in enumerate(files):
+                if errors:
+                    break
+                queue.put((get_dest_file(file, args.source_path, args.documentation_path), render_file(index)))
+    finally:
+        queue.put(None)
+        writer.join()
+    # the writer only collects its errors, fail like a write in this thread would
+    if errors:
+        raise errors[0]
+    progress.finish()
 
 
 def get_dest_file(filename, search_path, doc_path):
@@ -142,7 +275,7 @@ def auto_document(members, args, exclusion_list, fp):
         add = True
         if member['name'] in exclusion_list:
             add = False
-        if args.undoc is False and len(member['docstring']) == 0:
+        if args.undoc is False and not member['documented']:
             add = False
         if args.private is False and member['scope'] != 'public':
             add = False
@@ -169,7 +302,7 @@ def document(members, args, exclusion_list, file, fp, indent):
         add = True
         if member['name'] in exclusion_list:
             add = False
-        if args.undoc is False and len(member['docstring']) == 0:
+        if args.undoc is False and not member['documented']:
             add = False
         if args.private is False and member['scope'] != 'public':
             add = False
@@ -197,7 +330,7 @@ def document_member(parent, args, exclusion_list, file, fp, indent):
         add = True
         if member['name'] in exclusion_list:
             add = False
-        if args.undoc is False and len(member['docstring']) == 0:
+        if args.undoc is False and not member['documented']:
             add = False
         if args.private is False and member['scope'] != 'public':
             add = False
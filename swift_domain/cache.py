@@ -0,0 +1,190 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+
+import hashlib
+import os
+import pickle
+
+
+def file_digest(filename):
+    h = hashlib.sha1()
+    with open(filename, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class SwiftIndexCache(object):
+    """On-disk cache for the per-file results of the Swift indexer.
+
+    Entries are keyed by file name and validated by size and mtime, if the
+    mtime changed but the size did not the content hash decides. A cache
+    written by another parser version is discarded completely.
+    """
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.entries = {}  # filename -> (size, mtime, digest, symbols)
+        self.seen = set()
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as fp:
+                version, entries = pickle.load(fp)
+        except (IOError, OSError, EOFError, ValueError, TypeError,
+                AttributeError, ImportError, pickle.UnpicklingError):
+            return
+        if version != self.version:
+            self.dirty = True
+            return
+
+        # drop entries of files that vanished or obviously changed
+        for filename, entry in entries.items():
+            try:
+                st = os.stat(filename)
+            except OSError:
+                self.dirty = True
+                continue
+            if st.st_size != entry[0]:
+                self.dirty = True
+                continue
+            self.entries[filename] = entry
+
+    def get(self, filename):
+        """Return the cached symbols for a file or `None` if it changed."""
+        entry = self.entries.get(filename)
+        if entry is None:
+            return None
+        size, mtime, digest, symbols = entry
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        if st.st_size != size:
+            return None
+        if st.st_mtime_ns != mtime:
+            # touched, but maybe not modified
+            if file_digest(filename) != digest:
+                return None
+            self.entries[filename] = (size, st.st_mtime_ns, digest, symbols)
+            self.dirty = True
+        self.seen.add(filename)
+        return symbols
+
+    def put(self, filename, symbols):
+        st = os.stat(filename)
+        self.entries[filename] = (st.st_size, st.st_mtime_ns, file_digest(filename), symbols)
+        self.seen.add(filename)
+        self.dirty = True
+
+    def save(self):
+        """Write the cache, entries not used since loading are dropped."""
+        if len(self.seen) != len(self.entries):
+            self.entries = dict((k, v) for k, v in self.entries.items() if k in self.seen)
+            self.dirty = True
+        if not self.dirty:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as fp:
+            pickle.dump((self.version, self.entries), fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+class RstCache(object):
+    """On-disk cache for the RST autodoc generates for Swift symbols.
+
+    Entries are keyed by the digest of a symbol's declaration and documentation
+    comment and the options used, so they never go stale. Like domain data the
+    keys are tracked per document, entries no document uses are dropped on
+    saving.
+    """
+
+    def __init__(self, path, version):
+        self.path = path
+        self.version = version
+        self.entries = {}  # key -> lines
+        self.docs = {}     # docname -> set of keys
+        self.added = {}    # entries not saved yet
+        self.cleared = {}  # docname -> keys before it was read again
+        self.dirty = False
+        self.load()
+
+    def __getstate__(self):
+        # parallel readers send back only what they added
+        return {'path': self.path, 'version': self.version, 'docs': self.docs, 'added': self.added}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.entries = dict(self.added)
+        self.cleared = {}
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as fp:
+                version, docs, entries = pickle.load(fp)
+        except (IOError, OSError, EOFError, ValueError, TypeError,
+                AttributeError, ImportError, pickle.UnpicklingError):
+            return
+        if version != self.version:
+            self.dirty = True
+            return
+        self.docs = docs
+        self.entries = entries
+
+    def lines(self, docname, key, generate):
+        """Return the cached lines for `key`, calling `generate` on a miss."""
+        lines = self.entries.get(key)
+        if lines is None:
+            lines = tuple(generate())
+            self.entries[key] = lines
+            self.added[key] = lines
+        self.docs.setdefault(docname, set()).add(key)
+        return lines
+
+    def clear_doc(self, docname):
+        keys = self.docs.pop(docname, set())
+        self.cleared.setdefault(docname, keys)
+
+    def merge(self, docnames, other):
+        for docname in docnames:
+            if docname in other.docs:
+                self.docs[docname] = other.docs[docname]
+        self.entries.update(other.added)
+        self.added.update(other.added)
+
+    def save(self, docnames):
+        """Write the cache if documents use other entries than before.
+
+        Documents not in `docnames` and entries no document uses are dropped.
+        """
+        for docname in [x for x in self.docs if x not in docnames]:
+            del self.docs[docname]
+            self.dirty = True
+        if not (self.dirty or self.added or any(
+                self.docs.get(docname, set()) != keys for docname, keys in self.cleared.items())):
+            return
+        used = set()
+        for keys in self.docs.values():
+            used.update(keys)
+        if len(used) != len(self.entries):
+            self.entries = dict((k, v) for k, v in self.entries.items() if k in used)
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as fp:
+            pickle.dump((self.version, self.docs, self.entries), fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self.added = {}
+        self.cleared = {}
+        self.dirty = False
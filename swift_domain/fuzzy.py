@@ -0,0 +1,81 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+
+from collections import Counter
+from difflib import SequenceMatcher
+
+
+def trigrams(name):
+    padded = '  ' + name.lower() + ' '
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class FuzzyMatcher(object):
+    """Trigram index over names to suggest the closest one to a typo.
+
+    Candidates sharing the most trigrams with the query are shortlisted and
+    only those are scored, trigrams occurring in more than `max_postings`
+    names are not counted, which bounds the work per query. If every shared
+    trigram is that common, the names of the rarest one are ranked instead,
+    if none is shared at most `max_postings` names are scored.
+    """
+
+    def __init__(self, names, shortlist=32, max_postings=5000):
+        self.names = list(names)
+        self.shortlist = shortlist
+        self.max_postings = max_postings
+        self.postings = {}  # trigram -> indices into names
+        for (index, name) in enumerate(self.names):
+            for gram in trigrams(name):
+                self.postings.setdefault(gram, []).append(index)
+        self.cache = {}
+
+    def best(self, query):
+        """Return the best match with a score like `("Foo", 90)`, `None` if there are no names."""
+        if query not in self.cache:
+            self.cache[query] = self._best(query)
+        return self.cache[query]
+
+    def _candidates(self, query):
+        counts = Counter()
+        frequent = []
+        for gram in trigrams(query):
+            postings = self.postings.get(gram)
+            if not postings:
+                continue
+            if len(postings) <= self.max_postings:
+                counts.update(postings)
+            else:
+                frequent.append(postings)
+        if counts:
+            return [index for index, _count in counts.most_common(self.shortlist)]
+
+        if frequent:
+            # all shared trigrams are common, rank the names of the rarest one
+            frequent.sort(key=len)
+            pool = set(frequent[0][:self.max_postings])
+            for postings in frequent:
+                counts.update(index for index in postings if index in pool)
+            return [index for index, _count in counts.most_common(self.shortlist)]
+
+        # nothing in common, score a bounded number of names
+        return range(min(len(self.names), self.max_postings))
+
+    def _best(self, query):
+        if not self.names:
+            return None
+
+        q = query.lower()
+        matcher = SequenceMatcher(None, b=q)
+        best = None
+        for index in self._candidates(query):
+            name = self.names[index]
+            matcher.set_seq1(name.lower())
+            score = matcher.ratio()
+            if '.' in name and '.' not in q:
+                # `Inner` is a good guess for `Outer.Inner`
+                matcher.set_seq1(name.rsplit('.', 1)[1].lower())
+                score = max(score, matcher.ratio() * 0.9)
+            if best is None or score > best[1]:
+                best = (name, score)
+        return best[0], int(round(best[1] * 100))
@@ -4,10 +4,24 @@
 
 import re
 import fnmatch
+import hashlib
 import io
 import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pprint import PrettyPrinter
-from fuzzywuzzy import process
+
+from swift_domain.cache import SwiftIndexCache
+from swift_domain.fuzzy import FuzzyMatcher
+
+# bump whenever the structure of indexed symbols changes, invalidates caches
+PARSER_VERSION = 8
+
+# bump whenever the RST generated for symbols changes, invalidates RST caches
+# together with the parser version, as the RST is generated from parsed fields
+RST_VERSION = 1
 
 
 # member patterns
@@ -17,41 +31,27 @@ var_pattern       = re.compile(r'\s*(final\s+|@IBDesignable\s+|@IBInspectable\s+
 proto_var_pattern = re.compile(r'\s*(?P<static>static\s+)?(?P<type>var\s+)(?P<name>[a-zA-Z_][a-zA-Z0-9_]*\b)(?P<rest>[^{]*)(?P<computed>\s*{(?:\s*get\s+set\s*|\s*get\s*|\s*set\s*)}\s*)?')
 case_pattern      = re.compile(r'\s*(?P<type>case)\s+(?P<name>[a-zA-Z_][a-zA-Z0-9_]*\b)(\s*(?P<assoc_type>\([a-zA-Z_[(][a-zA-Z0-9_<>[\]()?!:, \t-]*\))\s*)?(\s*=\s*(?P<raw_value>.*))?')
 
+# leading modifiers and keyword of a declaration, selects the pattern to try
+declaration_pattern = re.compile(r'\s*(?P<modifiers>(?:(?:@[a-zA-Z_][a-zA-Z0-9_]*|final|private|public|open|internal|convenience|static|class|mutating)(?:\s*\((?:set|get)\))?\s+)*)(?P<keyword>[a-zA-Z_][a-zA-Z0-9_]*)')
+
 # markdown doc patterns
-param_pattern   = re.compile(r'^\s*- [pP]arameter\s*(?P<param>[^:]*):\s*(?P<desc>.*)')
 param_abbreviated_pattern = re.compile(r'^(?P<indent>\s*)- (?P<param>.*):\s*(?P<desc>.*)')
 
-attention_pattern  = re.compile(r'^\s*- [aA]ttention\s*:\s*(?P<desc>.*)')
-author_pattern  = re.compile(r'^\s*- [aA]uthor\s*:\s*(?P<desc>.*)')
-authors_pattern  = re.compile(r'^\s*- [aA]uthors\s*:\s*(?P<desc>.*)')
-bug_pattern  = re.compile(r'^\s*- [bB]ug\s*:\s*(?P<desc>.*)')
-complexity_pattern  = re.compile(r'^\s*- [cC]omplexity\s*:\s*(?P<desc>.*)')
-copyright_pattern  = re.compile(r'^\s*- [cC]opyright\s*:\s*(?P<desc>.*)')
-date_pattern  = re.compile(r'^\s*- [dD]ate\s*:\s*(?P<desc>.*)')
-example_pattern  = re.compile(r'^\s*- [eE]xample\s*:\s*(?P<desc>.*)')
-experiment_pattern  = re.compile(r'^\s*- [eE]xperiment\s*:\s*(?P<desc>.*)')
-important_pattern  = re.compile(r'^\s*- [iI]mportant\s*:\s*(?P<desc>.*)')
-invariant_pattern  = re.compile(r'^\s*- [iI]nvariant\s*:\s*(?P<desc>.*)')
-note_pattern  = re.compile(r'^\s*- [nN]ote\s*:\s*(?P<desc>.*)')
-precondition_pattern  = re.compile(r'^\s*- [pP]recondition\s*:\s*(?P<desc>.*)')
-postcondition_pattern  = re.compile(r'^\s*- [pP]ostcondition\s*:\s*(?P<desc>.*)')
-remark_pattern  = re.compile(r'^\s*- [rR]emark\s*:\s*(?P<desc>.*)')
-requires_pattern  = re.compile(r'^\s*- [rR]equires\s*:\s*(?P<desc>.*)')
-returns_pattern  = re.compile(r'^\s*- [rR]eturns\s*:\s*(?P<desc>.*)')
-seealso_pattern  = re.compile(r'^\s*- [sS]eealso\s*:\s*(?P<desc>.*)')
-since_pattern  = re.compile(r'^\s*- [sS]ince\s*:\s*(?P<desc>.*)')
-version_pattern  = re.compile(r'^\s*- [vV]ersion\s*:\s*(?P<desc>.*)')
-warning_pattern  = re.compile(r'^\s*- [wW]arning\s*:\s*(?P<desc>.*)')
-throws_pattern  = re.compile(r'^\s*- [tT]hrow[s]?\s*:\s*(?P<desc>.*)')
-default_pattern = re.compile(r'^\s*- [dD]efault[s]?\s*:\s*(?P<desc>.*)')
-
-typical_patterns = {"attention":attention_pattern,"author":author_pattern,"authors":authors_pattern,
-"bug":bug_pattern,"complexity":complexity_pattern,"copyright":copyright_pattern,
-"date":date_pattern,"example":example_pattern,"experiment":experiment_pattern,
-"important":important_pattern,"invariant":invariant_pattern,"note":note_pattern,"precondition":precondition_pattern,
-"postcondition":postcondition_pattern,"remark":remark_pattern,"requires":requires_pattern,"returns":returns_pattern,
-"see also":seealso_pattern,"since":since_pattern,"version":version_pattern,
-"warning":warning_pattern,"throws":throws_pattern,"default":default_pattern}
+# `- Keyword:` callouts and their field names, `- Parameter name:` takes precedence
+callout_fields = {
+    "attention": "attention", "author": "author", "authors": "authors", "bug": "bug",
+    "complexity": "complexity", "copyright": "copyright", "date": "date", "example": "example",
+    "experiment": "experiment", "important": "important", "invariant": "invariant", "note": "note",
+    "precondition": "precondition", "postcondition": "postcondition", "remark": "remark",
+    "requires": "requires", "returns": "returns", "seealso": "see also", "since": "since",
+    "version": "version", "warning": "warning", "throw": "throws", "throws": "throws",
+    "default": "default", "defaults": "default"
+}
+callout_pattern = re.compile(
+    r'^\s*- (?:[pP]arameter\s*(?P<param>[^:]*)|(?P<keyword>' +
+    '|'.join('[' + k[0] + k[0].upper() + ']' + k[1:] for k in callout_fields) +
+    r')\s*):\s*(?P<desc>.*)'
+)
 
 codeblock_pattern = re.compile(r'```')
 code_pattern = re.compile(r'`(?P<code>[^`]*)\`')
@@ -100,241 +100,485 @@ def balance_braces(line, brace_count):
     return braces
 
 
-# fetch documentation block
-def get_doc_block(content, line):
-
-    # search upwards for documentation lines
-    doc_block = []
-    for i in range(line, 0, -1):
-        l = content[i].strip()
-        if l.strip().startswith('///'):
-            converted = l[3:].rstrip()
-            doc_block.insert(0, converted)
-            continue
-        break
-
-    #did we find a standard comment?
-    if doc_block: return doc_block
-    block_detected = False
-
-    for i in reversed(content[:line+1]):
-        l = i.rstrip()
-        startsComment = False
-        endsComment = False
-        if l.endswith("*/"):
-            endsComment = True
-            l = l[:-2]
-            block_detected = True
-        if l.strip().startswith("/**"):
-            startsComment = True
-            l = l.strip()[3:]
-        elif l.startswith("/*"):
-            return [] #not a doc comment
-
-        if not block_detected: #don't go searching arbitrarily far back
-            break
-
-        #insert on top
-        doc_block.insert(0,l)
-
-        if startsComment:
-            break
-    return doc_block
-
+def scan_declaration(line):
+    """Split a line into its leading modifiers and the keyword following them.
+
+    This accepts more than the member and symbol patterns do, so it is only
+    used to select the one pattern that could match the line.
+    """
+    match = declaration_pattern.match(line)
+    if not match:
+        return None, None
+    return match.group('modifiers'), match.group('keyword')
+
+
+class DocComments(object):
+    """Documentation comments of a file, indexed by the line they end on.
+
+    The table is built in one forward pass: every line of a `///` run maps to
+    the first line of the run, the closing line of a `/** */` block maps to
+    its opening line. Closing lines of plain `/* */` comments map to `None`.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.spans = {}  # last line -> (first line, kind)
+        run_start = None
+        opener = None  # (line, is_doc) of the most recent block comment start
+        for (index, line) in enumerate(content):
+            if line.strip().startswith('///'):
+                if run_start is None:
+                    run_start = index
+                self.spans[index] = (run_start, '///')
+                continue
+            run_start = None
+
+            l = line.rstrip()
+            ends = l.endswith('*/')
+            if ends:
+                l = l[:-2]
+            if l.strip().startswith('/**'):
+                opener = (index, True)
+            elif l.lstrip().startswith('/*'):
+                opener = (index, False)
+            if ends and opener is not None:
+                self.spans[index] = (opener[0], '/**') if opener[1] else None
+
+    def span(self, line):
+        """Return `(first line, kind)` of the documentation block ending on `line` or `None`."""
+        return self.spans.get(line)
+
+    def digest(self, line):
+        """Digest of the declaration on `line` and the documentation block above it."""
+        span = self.spans.get(line - 1)
+        start = span[0] if span is not None else line
+        return hashlib.blake2b(''.join(self.content[start:line + 1]).encode('utf-8'), digest_size=16).digest()
+
+    def block(self, line):
+        """Return the documentation block ending on `line` as a list of strings."""
+        span = self.spans.get(line)
+        if span is None:
+            return []
+        return self.text(self.content, span[0], line, span[1])
 
-def doc_block_to_rst(doc_block):
-    # sphinx requires a newline between documentation and directives
-    # but Swift does not
-    global was_doc
-    was_doc = True
-
-    def emit_doc():
-        global was_doc
-        if not was_doc:
-            was_doc = True
+    @staticmethod
+    def text(content, start, end, kind):
+        if kind == '///':
+            return [l.strip()[3:].rstrip() for l in content[start:end + 1]]
+
+        doc_block = []
+        for i in range(start, end + 1):
+            l = content[i].rstrip()
+            if l.endswith('*/'):
+                l = l[:-2]
+            if i == start:
+                l = l.strip()[3:]
+            doc_block.append(l)
+        return doc_block
+
+
+@lru_cache(maxsize=32)
+def source_lines(filename):
+    """Lines of a Swift file, shared by the records reading their text from it."""
+    with io.open(filename, mode="r",encoding="utf-8") as fp:
+        return tuple(fp.readlines())
+
+
+class RstConverter(object):
+    """Converts the markdown of a documentation comment to reStructuredText.
+
+    The state is kept in the instance, so any number of blocks can be
+    converted at the same time.
+    """
+
+    def __init__(self):
+        # sphinx requires a newline between documentation and directives
+        # but Swift does not
+        self.was_doc = True
+
+    def emit_doc(self):
+        if not self.was_doc:
+            self.was_doc = True
             return True
         return False
 
-    def emit_directive():
-        global was_doc
-        if was_doc:
-            was_doc = False
+    def emit_directive(self):
+        if self.was_doc:
+            self.was_doc = False
             return True
         return False
 
-    code_mode = False
-    parameter_mode = False
-    parameter_indent = None
-    for l in doc_block:
-        if codeblock_pattern.match(l):
-            if not code_mode:
-                code_mode = True
-                yield '.. code-block:: swift'
-                yield ''
-                continue
-            else:
-                code_mode = False
+    def convert(self, doc_block):
+        code_mode = False
+        parameter_mode = False
+        parameter_indent = None
+        for l in doc_block:
+            if codeblock_pattern.match(l):
+                if not code_mode:
+                    code_mode = True
+                    yield '.. code-block:: swift'
+                    yield ''
+                    continue
+                else:
+                    code_mode = False
+                    continue
+            if code_mode:
+                yield '    ' + l
                 continue
-        if code_mode:
-            yield '    ' + l
-            continue
-        if parameter_mode:
-
-            match = param_abbreviated_pattern.match(l)
-            if match == None:
-                parameter_mode = False
-                parameter_indent = None
-            else:
-                match = match.groupdict()
-                if parameter_indent and parameter_indent != match['indent']:
+            if parameter_mode:
+
+                match = param_abbreviated_pattern.match(l)
+                if match == None:
                     parameter_mode = False
                     parameter_indent = None
                 else:
-                    parameter_indent = match['indent']
-                    yield ':parameter ' + match['param'] + ': ' + match['desc']
-                    continue
+                    match = match.groupdict()
+                    if parameter_indent and parameter_indent != match['indent']:
+                        parameter_mode = False
+                        parameter_indent = None
+                    else:
+                        parameter_indent = match['indent']
+                        yield ':parameter ' + match['param'] + ': ' + match['desc']
+                        continue
 
-        l = l.replace('\\','\\\\')
-        l = code_pattern.sub(r':literal:`\g<code>` ',l)
+            l = l.replace('\\','\\\\')
+            if '`' in l:
+                l = code_pattern.sub(r':literal:`\g<code>` ',l)
 
-        #l = emphasis_pattern.sub(r'**\g<emphasis>**',l)
+            if l == ' - Parameters:' or l == "- parameters:":
+               parameter_mode = True
+               yield ''
+               continue
 
-        if l == ' - Parameters:' or l == "- parameters:":
-           parameter_mode = True
-           yield ''
-           continue
+            match = callout_pattern.match(l)
+            if match:
+                if self.emit_directive(): yield ''
+                keyword = match.group('keyword')
+                if keyword is None:
+                    yield ':parameter ' + match.group('param') + ': ' + match.group('desc')
+                else:
+                    yield ':' + callout_fields[keyword.lower()] + ': ' + match.group('desc')
+                continue
 
-        match = param_pattern.match(l)
-        if match:
-            match = match.groupdict()
-            if emit_directive(): yield ''
-            yield ':parameter ' + match ['param'] + ': ' + match['desc']
-            continue
+            if not self.was_doc and l.strip() != "":
+                yield "    " + l.strip()
+                continue
 
-        c = False #continue if required
-        for name,pattern in list(typical_patterns.items()):
-            match = pattern.match(l)
-            if match:
-                match = match.groupdict()
-                if emit_directive(): yield ''
-                yield ':' + name + ': ' + match['desc']
-                c = True
-                break
-        if c: continue
+            #if we've got here, assume it's doc
+            if self.emit_doc(): yield ''
+            yield l.strip()
 
-        if not was_doc and l.strip() != "":
-            yield "    " + l.strip()
-            continue
 
-        #if we've got here, assume it's doc
-        if emit_doc(): yield ''
-        yield l.strip()
+def doc_block_to_rst(doc_block):
+    return RstConverter().convert(doc_block)
 
 
-class SwiftFileIndex(object):
-    symbol_signatures = [class_sig(), enum_sig(), struct_sig(), extension_sig(), protocol_sig()]
+def intern(value):
+    return sys.intern(value) if value is not None else None
 
-    def __init__(self, search_path):
+
+class Record(object):
+    """Compact index entry, can be used like the dict it replaced (`item['name']`).
+
+    Only the line span of the declaration and its documentation comment are
+    stored, the text is read from the source file when it is accessed.
+    """
+    __slots__ = ()
+    fields = ()
+    interned = ()  # slots holding strings shared by many records
+
+    def __init__(self, **kwargs):
+        for key in self.__slots__:
+            setattr(self, key, kwargs.get(key))
+
+    def __getstate__(self):
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def __setstate__(self, state):
+        # unpickled strings are copies, records from the cache or from worker
+        # processes would not share them otherwise
+        for key, value in zip(self.__slots__, state):
+            setattr(self, key, intern(value) if key in self.interned else value)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return list(self.fields)
+
+    @property
+    def documented(self):
+        return self.doc_start is not None
+
+    @property
+    def docstring(self):
+        if self.doc_start is None:
+            return ()
+        return tuple(DocComments.text(source_lines(self.file), self.doc_start, self.line - 1, self.doc_kind))
+
+    @property
+    def raw(self):
+        return source_lines(self.file)[self.line]
+
+
+class SwiftSymbol(Record):
+    """Type declaration: class, struct, enum, protocol or extension."""
+    __slots__ = ('file', 'line', 'depth', 'type', 'scope', 'name', 'doc_start', 'doc_kind', 'digest',
+                 'param', 'where', 'children', 'members')
+    fields = ('file', 'line', 'depth', 'type', 'scope', 'name', 'documented', 'docstring', 'digest',
+              'param', 'where', 'children', 'members', 'raw')
+    interned = ('file', 'type', 'scope', 'name', 'doc_kind')
+
+
+class SwiftMember(Record):
+    """Member of a type: function, initializer, variable, constant or enum case."""
+    __slots__ = ('file', 'scope', 'line', 'type', 'name', 'static', 'doc_start', 'doc_kind', 'digest',
+                 'rest', 'assoc_type', 'raw_value')
+    fields = ('file', 'scope', 'line', 'type', 'name', 'static', 'documented', 'docstring', 'digest',
+              'rest', 'assoc_type', 'raw_value', 'raw')
+    interned = ('file', 'scope', 'type', 'name', 'static', 'doc_kind')
+
+
+# directories of VCS and dependency managers, skipped unless configured otherwise
+default_exclude_patterns = ['.git', '.build', 'Pods', 'Carthage', 'DerivedData']
+
+
+def compile_patterns(patterns):
+    if not patterns:
+        return None
+    return re.compile('|'.join('(?:%s)' % fnmatch.translate(p) for p in patterns)).match
+
+
+def discover_files(search_path, include_patterns=None, exclude_patterns=None):
+    """Yield the Swift files below the directories in `search_path`.
+
+    Glob patterns are matched against the name and against the path relative
+    to the search path directory, excluded directories are not descended
+    into. Symlinked directories are followed once, every file is yielded
+    only once even if reachable on several paths.
+    """
+    include = compile_patterns(include_patterns if include_patterns is not None else ['*.swift'])
+    exclude = compile_patterns(exclude_patterns if exclude_patterns is not None else default_exclude_patterns)
+    seen_dirs = set()
+    seen_files = set()
+    for path in search_path:
+        stack = [(path, '')]
+        while stack:
+            directory, rel = stack.pop()
+            real_dir = os.path.realpath(directory)
+            if real_dir in seen_dirs:
+                continue
+            seen_dirs.add(real_dir)
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                entry_rel = rel + entry.name
+                if exclude and (exclude(entry.name) or exclude(entry_rel)):
+                    continue
+                try:
+                    if entry.is_dir():
+                        subdirs.append((entry.path, entry_rel + '/'))
+                        continue
+                    if not include or not (include(entry.name) or include(entry_rel)) or not entry.is_file():
+                        continue
+                    if entry.is_symlink():
+                        real_file = os.path.realpath(entry.path)
+                    else:
+                        real_file = os.path.join(real_dir, entry.name)
+                except OSError:
+                    continue
+                if real_file not in seen_files:
+                    seen_files.add(real_file)
+                    yield entry.path
+
+            # depth first, in name order like the files
+            stack.extend(reversed(subdirs))
+
+
+class SwiftFileIndex(object):
+    symbol_signatures = {
+        'class': class_sig(),
+        'enum': enum_sig(),
+        'struct': struct_sig(),
+        'extension': extension_sig(),
+        'protocol': protocol_sig()
+    }
+
+    def __init__(self, search_path, cache_path=None, jobs=1, include_patterns=None, exclude_patterns=None,
+                 progress=None):
         self.index = []
+        source_lines.cache_clear()
 
-        # find all files
+        cache = SwiftIndexCache(cache_path, PARSER_VERSION) if cache_path else None
         self.files = []
-        for path in search_path:
-            for root, dirnames, filenames in os.walk(path):
-                for filename in fnmatch.filter(filenames, '*.swift'):
-                    self.files.append(os.path.join(root, filename))
+        results = {}
+
+        # stream discovered files that are not cached into the parser
+        def pending():
+            for file in discover_files(search_path, include_patterns, exclude_patterns):
+                self.files.append(file)
+                symbols = cache.get(file) if cache else None
+                if symbols is None:
+                    yield file
+                else:
+                    results[file] = symbols
 
+        for file, symbols in self.parse_files(pending(), jobs=jobs):
+            if progress is None:
+                print(("Indexing swift file: %s" % file))
+            else:
+                progress(file)
+            results[file] = symbols
+            if cache:
+                cache.put(file, symbols)
+
+        # merge in discovery order, independent of the order workers finish in
         for file in self.files:
-            print(("Indexing swift file: %s" % file))
-            symbol_stack = []
-            braces = 0
-            with io.open(file, mode="r",encoding="utf-8") as fp:
-
-                content = fp.readlines()
-                for (index, line) in enumerate(content):
-                    braces = balance_braces(line, braces)
-                    # track boxed context
-                    for pattern in self.symbol_signatures:
-                        match = pattern.match(line)
-                        if match:
-                            match = match.groupdict()
-
-                            struct = match['struct'].strip()
-                            if 'scope' in match and match['scope']:
-                                scope = match['scope'].strip()
-                            else:
-                                if struct == 'extension':
-                                    scope = 'public'
-                                else:
-                                    scope = 'internal'
-
-                            if scope == 'open':
-                                scope = 'public'
-                            item = {
-                                'file': file,
-                                'line': index,
-                                'depth': braces,
-                                'type': struct,
-                                'scope': scope,
-                                'name': match['name'].strip(),
-                                'docstring': get_doc_block(content, index - 1),
-                                'param': match['type'].strip() if match['type'] else None,
-                                'where': match['where'].strip() if 'where' in match and match['where'] else None,
-                                'children': [],
-                                'raw': line
-                            }
-                            if len(symbol_stack) > 0 and braces > symbol_stack[-1]['depth']:
-                                symbol_stack[-1]['children'].append(item)
-                            else:
-                                symbol_stack.append(item)
-
-                            # find members
-                            start = index
-                            if line.rstrip()[-1] == '{':
-                                start = index + 1
-                            else:
-                                for i in range(index + 1, len(content)):
-                                    l = content[i].lstrip()
-                                    if len(l) > 0 and l[0] == '{':
-                                        start = i
-                                        break
-                            item['members'] = SwiftObjectIndex(content, start, item['type'])
-
-            self.index.extend(symbol_stack)
-
-    def find(self, name, index=None, name_prefix=[]):
-        if not index:
-            index = self.index
+            self.index.extend(results[file])
+
+        if cache:
+            cache.save()
+
+        # fully qualified name -> items, in the order of a depth first walk
+        self.names = {}
+        self.add_names(self.index)
+        self.fuzzy = None
+
+    @classmethod
+    def parse_files(cls, files, jobs=1):
+        """Parse files, in a pool of `jobs` processes if more than one, yields `(file, symbols)` in order."""
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                window = deque()
+                for file in files:
+                    window.append((file, executor.submit(cls.parse_file, file)))
+                    if len(window) >= jobs * 4:
+                        file, future = window.popleft()
+                        yield file, future.result()
+                while window:
+                    file, future = window.popleft()
+                    yield file, future.result()
+        else:
+            for file in files:
+                yield file, cls.parse_file(file)
+
+    @classmethod
+    def parse_file(cls, file):
+        """Parse a single Swift file, returns the list of toplevel symbols.
+
+        Types and their members are collected in one forward pass: a line is
+        matched against the member patterns of the innermost open type if it
+        starts or ends on the brace level of that type's body.
+        """
+        with io.open(file, mode="r",encoding="utf-8") as fp:
+            content = fp.readlines()
+        comments = DocComments(content)
+
+        symbol_stack = []
+        bodies = []  # (brace depth of the body, members) for every open type body
+        pending = None  # (brace depth, members) of a type whose `{` is on a later line
+        braces = 0
+        for (index, line) in enumerate(content):
+            old_braces = braces
+            braces = balance_braces(line, braces)
+            modifiers, keyword = scan_declaration(line)
+
+            # members of the innermost type
+            if bodies:
+                depth, members = bodies[-1]
+                if braces >= depth and (old_braces == depth or braces == depth):
+                    members.parse_line(content, index, keyword, comments)
+
+            # track boxed context, `class` may be followed by the type name
+            item = None
+            pattern = cls.symbol_signatures.get('class' if modifiers and 'class' in modifiers else keyword)
+            if pattern:
+                match = pattern.match(line)
+                if match:
+                    match = match.groupdict()
 
-        for item in index:
-            item_name = ".".join(name_prefix + [item['name']])
-            if name == item_name:
-                yield item
-            if len(item['children']) > 0:
-                new_prefix = list(name_prefix)
-                new_prefix.append(item['name'])
-                for result in self.find(name, index=item['children'], name_prefix=new_prefix):
-                    yield result
-
-    def __names(self,index,name_prefix):
-        """Return all names the receiver could find."""
-        for item in index:
-            yield ".".join(name_prefix + [item['name']])
-            for child in item['children']:
-                new_prefix = list(name_prefix)
-                new_prefix.append(item['name'])
-                for name in child.__names(item['children'],name_prefix=new_prefix):
-                    yield name
+                    struct = match['struct'].strip()
+                    if 'scope' in match and match['scope']:
+                        scope = match['scope'].strip()
+                    else:
+                        if struct == 'extension':
+                            scope = 'public'
+                        else:
+                            scope = 'internal'
 
+                    if scope == 'open':
+                        scope = 'public'
+                    doc = comments.span(index - 1) or (None, None)
+                    item = SwiftSymbol(
+                        file=intern(file),
+                        line=index,
+                        depth=braces,
+                        type=intern(struct),
+                        scope=intern(scope),
+                        name=intern(match['name'].strip()),
+                        doc_start=doc[0],
+                        doc_kind=intern(doc[1]),
+                        digest=comments.digest(index),
+                        param=match['type'].strip() if match['type'] else None,
+                        where=match['where'].strip() if 'where' in match and match['where'] else None,
+                        children=[],
+                        members=SwiftObjectIndex(struct, file)
+                    )
+                    if len(symbol_stack) > 0 and braces > symbol_stack[-1]['depth']:
+                        symbol_stack[-1]['children'].append(item)
+                    else:
+                        symbol_stack.append(item)
+
+            # open and close type bodies, `class Foo {}` has no members
+            if item is not None:
+                pending = None
+                if braces > old_braces:
+                    bodies.append((old_braces + 1, item['members']))
+                elif braces == old_braces and '{' not in line:
+                    pending = (braces, item['members'])
+            elif pending is not None:
+                if braces > pending[0]:
+                    bodies.append((pending[0] + 1, pending[1]))
+                    pending = None
+                elif braces < pending[0]:
+                    pending = None
+            while bodies and braces < bodies[-1][0]:
+                bodies.pop()
+
+        return symbol_stack
+
+    def add_names(self, index, name_prefix=''):
+        for item in index:
+            name = name_prefix + item['name']
+            self.names.setdefault(name, []).append(item)
+            if item['children']:
+                self.add_names(item['children'], name_prefix=name + '.')
 
+    def find(self, name):
+        """Return all items with the fully qualified name `name` (`Outer.Inner`)."""
+        return self.names.get(name, [])
 
-    def find_fuzz(self,name,index=None,name_prefix=[]):
-        if not index:
-            index = self.index
+    def find_fuzz(self, name):
         """Returns the best match with a score like ("Foo",90)"""
-        return process.extractOne(name,self.__names(index,name_prefix))
-
-
+        if self.fuzzy is None:
+            self.fuzzy = FuzzyMatcher(self.names)
+        return self.fuzzy.best(name)
 
     def by_file(self, index=None):
         result = {}
@@ -349,6 +593,12 @@ class SwiftFileIndex(object):
 
         return result
 
+    @staticmethod
+    def documentation_key(item, indent="    ", noindex=False, nodocstring=False, location=False):
+        """Cache key covering everything `documentation` depends on."""
+        return ('symbol', item['digest'], indent, noindex, nodocstring,
+                (item['file'], item['line']) if location else None)
+
     @staticmethod
     def documentation(item, indent="    ", noindex=False, nodocstring=False, location=False):
         if item['param']:
@@ -376,58 +626,82 @@ class SwiftFileIndex(object):
 
 
 class SwiftObjectIndex(object):
-
-    def __init__(self, content, line, typ):
-        signatures = [func_pattern, init_pattern, var_pattern]
-        if typ == 'enum':
-            signatures = [func_pattern, init_pattern, case_pattern]
-        elif typ == 'protocol':
-            signatures = [func_pattern, init_pattern, proto_var_pattern]
-
+    __slots__ = ('type', 'file', 'index')
+    signatures = {'func': func_pattern, 'init': init_pattern, 'var': var_pattern, 'let': var_pattern}
+    enum_signatures = {'func': func_pattern, 'init': init_pattern, 'case': case_pattern}
+    protocol_signatures = {'func': func_pattern, 'init': init_pattern, 'var': proto_var_pattern}
+
+    def __init__(self, typ, file):
+        self.type = typ
+        self.file = intern(file)
         self.index = []
-        braces = 1
-        for i in range(line, len(content)):
-            l = content[i]
 
-            # balance braces
-            old_braces = braces
-            braces = balance_braces(l, braces)
-            if braces <= 0:
-                break
-            if braces > 1 and old_braces == braces:
-                continue
+    def __getstate__(self):
+        return self.type, self.file, self.index
+
+    def __setstate__(self, state):
+        typ, file, self.index = state
+        self.type = intern(typ)
+        self.file = intern(file)
+
+    def parse_line(self, content, i, keyword, comments):
+        """Add the member declared on line `i`.
+
+        `keyword` is the keyword as returned by `scan_declaration`, `comments`
+        the `DocComments` of the file.
+        """
+        signatures = self.signatures
+        if self.type == 'enum':
+            signatures = self.enum_signatures
+        elif self.type == 'protocol':
+            signatures = self.protocol_signatures
+
+        if keyword and keyword.startswith('init'):
+            keyword = 'init'
+        pattern = signatures.get(keyword)
+        if not pattern:
+            return
+        l = content[i]
+        match = pattern.match(l)
+        if not match:
+            return
+
+        match = match.groupdict()
+        if 'scope' in match:
+            if match['scope']:
+                scope = match['scope'].strip()
+            else:
+                if self.type == 'protocol':
+                    scope = 'public'
+                else:
+                    scope = 'internal'
+        else:
+            scope = 'public'
+        if scope == 'open':
+            scope = 'public'
+        if "- noindex: true" in comments.block(i - 1):
+            return
+        doc = comments.span(i - 1) or (None, None)
+        self.index.append(SwiftMember(
+            file=self.file,
+            scope=intern(scope),
+            line=i,
+            type=intern(match['type'].strip()),
+            name=intern(match['name'].strip() if match['type'] != 'init' and match['type'] != 'init?' else 'init'),
+            static=intern(match['static'].strip() if 'static' in match and match['static'] else None),
+            doc_start=doc[0],
+            doc_kind=intern(doc[1]),
+            digest=comments.digest(i),
+            rest=match['rest'].strip() if 'rest' in match and match['rest'] else None,
+            assoc_type=match['assoc_type'].strip() if 'assoc_type' in match and match['assoc_type'] else None,
+            raw_value=match['raw_value'].strip() if 'raw_value' in match and match['raw_value'] else None
+        ))
 
-            for pattern in signatures:
-                match = pattern.match(l)
-                if match:
-                    match = match.groupdict()
-                    if 'scope' in match:
-                        if match['scope']:
-                            scope = match['scope'].strip()
-                        else:
-                            if typ == 'protocol':
-                                scope = 'public'
-                            else:
-                                scope = 'internal'
-                    else:
-                        scope = 'public'
-                    if scope == 'open':
-                        scope = 'public'
-                    docstring = get_doc_block(content, i - 1)
-                    if "- noindex: true" in docstring:
-                        continue
-                    self.index.append({
-                        'scope': scope,
-                        'line': i,
-                        'type': match['type'].strip(),
-                        'name': match['name'].strip() if match['type'] != 'init' and match['type'] != 'init?' else 'init',
-                        'static': match['static'].strip() if 'static' in match and match['static'] else None,
-                        'docstring': docstring,
-                        'rest': match['rest'].strip() if 'rest' in match and match['rest'] else None,
-                        'assoc_type': match['assoc_type'].strip() if 'assoc_type' in match and match['assoc_type'] else None,
-                        'raw_value': match['raw_value'].strip() if 'raw_value' in match and match['raw_value'] else None,
-                        'raw': l
-                    })
+    @staticmethod
+    def documentation_key(item, indent="    ", noindex=False, nodocstring=False, location=None):
+        """Cache key covering everything `documentation` depends on."""
+        return ('member', item['digest'], indent, noindex, nodocstring,
+                (location, item['line']) if location else None)
 
     @staticmethod
     def documentation(item, indent="    ", noindex=False, nodocstring=False, location=None):
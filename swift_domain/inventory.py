@@ -0,0 +1,218 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import time
+import zlib
+from functools import lru_cache
+from urllib.request import urlopen
+
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+default_inventory = os.path.join(os.path.dirname(__file__), 'external_symbols.txt')
+
+
+@lru_cache(maxsize=None)
+def load_inventory(filename):
+    """Read an inventory file into a dict of type name to URL template.
+
+    A line in brackets (``[https://example.com/{lower}]``) sets the template
+    for the whitespace separated names on the following lines, lines starting
+    with ``#`` are comments.
+    """
+    symbols = {}
+    template = None
+    with open(filename, encoding='utf-8') as fp:
+        for line in fp:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                template = line[1:-1]
+                continue
+            if template is None:
+                raise ValueError('%s: type names before the first URL template' % filename)
+            for name in line.split():
+                symbols[name] = template
+    return symbols
+
+
+class ExternalSymbols(object):
+    """Lookup of documentation URLs for types not documented in the project.
+
+    The bundled inventory is read on the first lookup, `extra` maps further
+    names to URLs or URL templates and takes precedence.
+    """
+
+    def __init__(self, extra=None, filename=default_inventory):
+        self.extra = extra or {}
+        self.filename = filename
+        self.symbols = None
+
+    def uri(self, name):
+        """Return the documentation URL of `name` or `None`."""
+        if self.symbols is None:
+            self.symbols = dict(load_inventory(self.filename))
+            self.symbols.update(self.extra)
+        template = self.symbols.get(name)
+        if template is None:
+            return None
+        return template.format(name=name, lower=name.lower())
+
+
+inventory_line = re.compile(r'(.+?)\s+(\S+)\s+(-?\d+)\s+?(\S*)\s+(.*)')
+table_magic = b'SWIFTINV1\n'
+table_types = ('class', 'struct', 'enum', 'protocol')
+
+
+def is_url(location):
+    return '://' in location
+
+
+def read_inventory(stream, base_uri):
+    """Yield `(name, objtype, priority, uri)` of the Swift objects in a Sphinx inventory."""
+    line = stream.readline().rstrip().decode('utf-8')
+    if line != '# Sphinx inventory version 2':
+        raise ValueError('unknown or unsupported inventory version: %r' % line)
+    stream.readline()  # project
+    stream.readline()  # version
+    if b'zlib' not in stream.readline():
+        raise ValueError('invalid inventory header: not compressed with zlib')
+
+    base_uri = base_uri.rstrip('/') + '/'
+    for line in zlib.decompress(stream.read()).decode('utf-8').splitlines():
+        m = inventory_line.match(line.rstrip())
+        if not m:
+            continue
+        name, objtype, priority, location, _ = m.groups()
+        if not objtype.startswith('swift:'):
+            continue
+        if location.endswith('$'):
+            location = location[:-1] + name
+        yield name, objtype[6:], int(priority), base_uri + location
+
+
+def write_table(filename, entries):
+    """Write `(key, uri)` pairs as a table sorted by key for `InventoryTable`."""
+    data = []
+    offsets = []
+    position = 0
+    for key, uri in sorted(entries):
+        if offsets and key == data[-1][0]:
+            continue
+        record = key + b'\0' + uri + b'\n'
+        data.append((key, record))
+        offsets.append(position)
+        position += len(record)
+
+    tmp = filename + '.tmp'
+    with open(tmp, 'wb') as fp:
+        fp.write(table_magic)
+        fp.write(struct.pack('<I', len(offsets)))
+        fp.write(struct.pack('<%dI' % len(offsets), *offsets))
+        for _, record in data:
+            fp.write(record)
+    os.replace(tmp, filename)
+
+
+class InventoryTable(object):
+    """Memory mapped lookup table of another project's Swift objects.
+
+    The file holds the number of entries, their offsets and the entries sorted
+    by key, lookups are binary searches in the mapped file so only the pages
+    touched are read.
+    """
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as fp:
+            self.map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(table_magic)] != table_magic:
+            raise ValueError('%s is not a Swift inventory table' % filename)
+        start = len(table_magic)
+        self.count, = struct.unpack_from('<I', self.map, start)
+        self.offsets = start + 4
+        self.data = self.offsets + 4 * self.count
+
+    def key(self, index):
+        start = self.data + struct.unpack_from('<I', self.map, self.offsets + 4 * index)[0]
+        return start, self.map.find(b'\0', start)
+
+    def get(self, name):
+        """Return the URL of the object `name` or `None`."""
+        key = name.encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start, end = self.key(mid)
+            if self.map[start:end] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count:
+            return None
+        start, end = self.key(lo)
+        if self.map[start:end] != key:
+            return None
+        return self.map[end + 1:self.map.find(b'\n', end)].decode('utf-8')
+
+
+def table_path(doctreedir, base_uri, location):
+    digest = hashlib.sha1(('%s\0%s' % (base_uri, location)).encode('utf-8')).hexdigest()
+    return os.path.join(doctreedir, 'swift-inventory-%s.table' % digest[:16])
+
+
+def inventory_tables(config, doctreedir):
+    """Yield the table files of the inventories configured in `swift_inventories`."""
+    for name, (base_uri, location) in config.swift_inventories.items():
+        yield name, base_uri, location or base_uri.rstrip('/') + '/objects.inv', \
+            table_path(doctreedir, base_uri, location)
+
+
+def update_inventories(app):
+    """Convert the configured inventories to lookup tables unless they are current.
+
+    Downloaded inventories are fetched again after ``swift_inventory_cache_limit``
+    days, local ones when the file changed.
+    """
+    cache_limit = app.config.swift_inventory_cache_limit * 86400
+    for name, base_uri, location, filename in inventory_tables(app.config, app.doctreedir):
+        if not is_url(location):
+            location = os.path.join(app.confdir, location)
+        try:
+            mtime = os.stat(filename).st_mtime
+            if is_url(location):
+                fresh = cache_limit < 0 or time.time() - mtime < cache_limit
+            else:
+                fresh = mtime >= os.stat(location).st_mtime
+        except OSError:
+            fresh = False
+        if fresh:
+            continue
+
+        logger.info('loading Swift inventory %s from %s...', name, location)
+        try:
+            if is_url(location):
+                stream = urlopen(location, timeout=30)
+            else:
+                stream = open(location, 'rb')
+            with stream:
+                entries = []
+                for objname, objtype, priority, uri in read_inventory(stream, base_uri):
+                    entries.append((objname.encode('utf-8'), uri.encode('utf-8')))
+                    typ, _sep, type_name = objname.partition(' ')
+                    if objtype == typ and typ in table_types and type_name:
+                        # types are referenced by their name alone
+                        entries.append((type_name.encode('utf-8'), uri.encode('utf-8')))
+        except Exception as e:
+            logger.warning('Swift inventory %s not fetchable due to %s: %s', name, e.__class__.__name__, e)
+            continue
+
+        if not os.path.isdir(app.doctreedir):
+            os.makedirs(app.doctreedir)
+        write_table(filename, entries)
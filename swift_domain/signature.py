@@ -0,0 +1,141 @@
+# Copyright 2016 by Johannes Schriewer
+# BSD license, see LICENSE for details
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Parameter = namedtuple('Parameter', ['name', 'variable_name', 'type', 'default', 'label'])
+Signature = namedtuple('Signature', ['name', 'generics', 'parameters', 'throws', 'return_type', 'selector'])
+
+# operator functions (`func <=(lhs: Foo, rhs: Foo)`) are named by operator characters
+name_pattern = re.compile(r'\s*[/=\-+!*%<>&|^~?]+|[^(<]*')
+token_pattern = re.compile(r'->|[()\[\]<>{},]')
+throws_pattern = re.compile(r'\b(re)?throws\b')
+openers = '([<{'
+
+type_token_pattern = re.compile(r'->|@\w+|[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*|[(\[<]|[)\]>]')
+label_pattern = re.compile(r'\s*:')
+type_keywords = frozenset(['_', 'inout', 'throws', 'rethrows', 'async', 'some', 'any', 'where'])
+
+
+def parse_parameter(parameter):
+    name, colon, rest = parameter.partition(':')
+    name = name.strip()
+    name_parts = name.split(' ', 1)
+    if len(name_parts) > 1:
+        name = name_parts[0]
+        variable_name = name_parts[1].strip()
+        label = name + ' ' + variable_name + ':'
+    else:
+        variable_name = name
+        label = name + ':'
+    param_type, equals, default_value = rest.partition('=')
+    return Parameter(
+        name,
+        variable_name,
+        param_type.strip(),
+        default_value.strip() if equals else None,
+        label
+    )
+
+
+@lru_cache(maxsize=4096)
+def parse_signature(objtype, sig):
+    """Split a function signature like ``draw<T>(in context: T) throws -> Bool``.
+
+    Works in one pass over the brackets, the arrow of a closure type is not
+    mistaken for a closing angle bracket.  Results are cached as the same
+    signatures are documented over and over in protocols and overloads.
+    """
+    name_end = name_pattern.match(sig).end()
+    name = 'init' if objtype == 'init' else sig[:name_end]
+
+    depth = 0
+    start = None
+    generics = None
+    parameter_list = None
+    splits = []
+    rest = ''
+    for m in token_pattern.finditer(sig, name_end):
+        token = m.group()
+        if token == '->':
+            if depth == 0 and parameter_list is not None:
+                rest = sig[m.end():]
+                break
+        elif token in openers:
+            if depth == 0:
+                start = m.start()
+            depth += 1
+        elif token == ',':
+            if depth == 1 and parameter_list is None:
+                splits.append(m.start())
+        else:
+            depth -= 1
+            if depth != 0:
+                continue
+            if token == '>' and generics is None and parameter_list is None:
+                generics = sig[start:m.end()]
+                splits = []
+            elif token == ')' and parameter_list is None:
+                parameter_list = (start, m.start())
+                throws_start = m.end()
+
+    parameters = ()
+    throws = False
+    if parameter_list is not None:
+        bounds = [parameter_list[0]] + splits + [parameter_list[1]]
+        if sig[bounds[0] + 1:bounds[-1]].strip():
+            parameters = tuple(
+                parse_parameter(sig[bounds[i] + 1:bounds[i + 1]])
+                for i in range(len(bounds) - 1)
+            )
+        throws = throws_pattern.search(sig, throws_start, len(sig) - len(rest)) is not None
+
+    return Signature(
+        name,
+        generics,
+        parameters,
+        throws,
+        rest.strip() or None,
+        name + '(' + ''.join(p.label for p in parameters) + ')'
+    )
+
+
+@lru_cache(maxsize=4096)
+def parse_type(typ):
+    """Split a type expression like ``[String: Foo]?`` into text and type names.
+
+    Returns a tuple of ``(text, is_type_name)`` pairs that concatenate to the
+    original string, attributes, keywords and the labels of tuple and closure
+    types are not type names.
+    """
+    segments = []
+    text_start = 0
+    brackets = []
+    for m in type_token_pattern.finditer(typ):
+        token = m.group()
+        if token in openers:
+            brackets.append(token)
+            continue
+        if token in ')]>':
+            if brackets:
+                brackets.pop()
+            continue
+        if token == '->' or token[0] == '@' or token in type_keywords:
+            continue
+        if brackets and brackets[-1] == '(' and label_pattern.match(typ, m.end()):
+            continue
+
+        end = m.end()
+        if token.endswith('.Type') or token.endswith('.Protocol'):
+            # metatypes link to the type itself
+            token = token.rsplit('.', 1)[0]
+            end = m.start() + len(token)
+        if m.start() > text_start:
+            segments.append((typ[text_start:m.start()], False))
+        segments.append((token, True))
+        text_start = end
+    if text_start < len(typ):
+        segments.append((typ[text_start:], False))
+    return tuple(segments)
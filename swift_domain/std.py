@@ -476,7 +476,9 @@ class SwiftStandardDomain(StandardDomain):
             'modindex': ('swift-modindex', ''),
             'search':   ('search', ''),
         },
+        'numfigs': {},      # labelname -> docname, figtype, figure_id
     }
+    data_version = 1
 
     dangling_warnings = {
         'term': 'term not in glossary: %(target)s',
@@ -493,7 +495,12 @@ class SwiftStandardDomain(StandardDomain):
         nodes.container: ('code-block', None),
     }
 
+    def __init__(self, env):
+        super(SwiftStandardDomain, self).__init__(env)
+        self.object_index = None  # name -> [(objtype, docname, labelid)]
+
     def clear_doc(self, docname):
+        self.object_index = None
         for key, (fn, _l) in list(self.data['progoptions'].items()):
             if fn == docname:
                 del self.data['progoptions'][key]
@@ -506,9 +513,13 @@ class SwiftStandardDomain(StandardDomain):
         for key, (fn, _l) in list(self.data['anonlabels'].items()):
             if fn == docname:
                 del self.data['anonlabels'][key]
+        for key, (fn, _l, _l) in list(self.data['numfigs'].items()):
+            if fn == docname:
+                del self.data['numfigs'][key]
 
     def merge_domaindata(self, docnames, otherdata):
         # XXX duplicates?
+        self.object_index = None
         for key, data in list(otherdata['progoptions'].items()):
             if data[0] in docnames:
                 self.data['progoptions'][key] = data
@@ -521,9 +532,14 @@ class SwiftStandardDomain(StandardDomain):
         for key, data in list(otherdata['anonlabels'].items()):
             if data[0] in docnames:
                 self.data['anonlabels'][key] = data
+        for key, data in list(otherdata['numfigs'].items()):
+            if data[0] in docnames:
+                self.data['numfigs'][key] = data
 
     def process_doc(self, env, docname, document):
+        self.object_index = None
         labels, anonlabels = self.data['labels'], self.data['anonlabels']
+        numfigs = self.data['numfigs']
         for name, explicit in iteritems(document.nametypes):
             if not explicit:
                 continue
@@ -543,6 +559,12 @@ class SwiftStandardDomain(StandardDomain):
 #                env.warn_node('duplicate label %s, ' % name + 'other instance '
 #                              'in ' + env.doc2path(labels[name][0]), node)
             anonlabels[name] = docname, labelid
+            # remember what :numref: needs instead of loading the doctree
+            target_node = document.ids.get(labelid)
+            figtype = self.get_figtype(target_node)
+            if figtype is not None:
+                figure_id = target_node['ids'][0] if target_node['ids'] else None
+                numfigs[name] = docname, figtype, figure_id
             if node.tagname == 'section':
                 sectname = clean_astext(node[0])  # node[0] == title node
             elif self.is_enumerable_node(node):
@@ -612,15 +634,13 @@ class SwiftStandardDomain(StandardDomain):
                          lineno=node.line)
                 return contnode
 
-            target_node = env.get_doctree(docname).ids.get(labelid)
-            figtype = self.get_figtype(target_node)
+            _, figtype, figure_id = self.data['numfigs'].get(target, (None, None, None))
             if figtype is None:
                 return None
 
             try:
-                figure_id = target_node['ids'][0]
                 fignumber = env.toc_fignumbers[docname][figtype][figure_id]
-            except (KeyError, IndexError):
+            except KeyError:
                 # target_node is found, but fignumber is not assigned.
                 # Maybe it is defined in orphaned document.
                 env.warn(fromdocname, "no number is assigned for %s: %s" % (figtype, labelid),
@@ -654,13 +674,10 @@ class SwiftStandardDomain(StandardDomain):
             target = target.strip()
             docname, labelid = self.data['progoptions'].get((progname, target), ('', ''))
             if not docname:
-                commands = []
-                while ws_re.search(target):
-                    subcommand, target = ws_re.split(target, 1)
-                    commands.append(subcommand)
-                    progname = "-".join(commands)
-
-                    docname, labelid = self.data['progoptions'].get((progname, target),
+                # try every split into subcommands and option
+                for m in ws_re.finditer(target):
+                    progname = ws_re.sub('-', target[:m.start()])
+                    docname, labelid = self.data['progoptions'].get((progname, target[m.end():]),
                                                                     ('', ''))
                     if docname:
                         break
@@ -693,12 +710,20 @@ class SwiftStandardDomain(StandardDomain):
             if res:
                 results.append(('std:' + role, res))
         # all others
-        for objtype in self.object_types:
-            key = (objtype, target)
+        if self.object_index is None:
+            self.object_index = {}
+            for (objtype, name), (docname, labelid) in iteritems(self.data['objects']):
+                self.object_index.setdefault(name, []).append((objtype, docname, labelid))
+        found = {}
+        for objtype, docname, labelid in self.object_index.get(target, ()):
+            if objtype != 'term':
+                found[objtype] = docname, labelid
+        for objtype, docname, labelid in self.object_index.get(ltarget, ()):
             if objtype == 'term':
-                key = (objtype, ltarget)
-            if key in self.data['objects']:
-                docname, labelid = self.data['objects'][key]
+                found[objtype] = docname, labelid
+        for objtype in self.object_types:
+            if objtype in found:
+                docname, labelid = found[objtype]
                 results.append(('std:' + self.role_for_objtype(objtype),
                                 make_refnode(builder, fromdocname, docname,
                                              labelid, contnode)))
@@ -9,7 +9,9 @@
     :license: BSD, see LICENSE for details.
 """
 
+import os
 import re
+from bisect import bisect_left, insort
 
 from docutils import nodes
 from docutils.parsers.rst import directives
@@ -19,25 +21,34 @@ from sphinx.roles import XRefRole
 from sphinx.locale import _, __
 from sphinx.domains import Domain, ObjType, Index
 from sphinx.directives import ObjectDescription
+from sphinx.util import logging
 from sphinx.util.nodes import make_refnode
 from sphinx.util.docfields import Field, GroupedField, TypedField
 from .std import SwiftStandardDomain
+from .indexer import default_exclude_patterns
+from .signature import parse_signature, parse_type
+from .inventory import ExternalSymbols, InventoryTable, inventory_tables, update_inventories
 
-# TODO: https://developer.apple.com/documentation/swift/ <String, Int ...>\\8	Int8	UInt8
-
-swift_reserved = set(['Int', 'Double', 'Float', 'String', 'Bool', 'Any', 'Equatable',
-    'CGFloat',
-    'UILabel', 'UIImageView', 'UIColor', 'UIImage', 'UIButton', 'UITextField', 'UIControl', 'UISlider',
-    'GLKView',
-    'CLLocation',
-    'Int16', 'Int32', 'Int64',
-    'UInt16', 'UInt32', 'UInt64', ])
+logger = logging.getLogger(__name__)
 
 def _iteritems(d):
     for k in d:
         yield k, d[k]
 
 
+def type_xrefs(typ, **attributes):
+    """Return text nodes for a type expression with a reference for each type name in it."""
+    result = []
+    for text, is_type_name in parse_type(typ):
+        if is_type_name:
+            ref = addnodes.pending_xref('', refdomain='swift', reftype='type', reftarget=text, **attributes)
+            ref += nodes.Text(text, text)
+            result.append(ref)
+        else:
+            result.append(nodes.Text(text, text))
+    return result
+
+
 class SwiftObjectDescription(ObjectDescription):
     option_spec = {
         'noindex': directives.flag,
@@ -58,7 +69,7 @@ class SwiftObjectDescription(ObjectDescription):
         if fullname not in self.state.document.ids:
             signode['ids'].append(signature)
             self.state.document.note_explicit_target(signode)
-            self.env.domaindata['swift']['objects'][fullname] = (self.env.docname, self.objtype, signature)
+            self.env.get_domain('swift').add_object(fullname, self.env.docname, self.objtype, signature)
         else:
             objects = self.env.domaindata['swift']['objects']
             self.warn('duplicate object description of %s, ' % fullname +
@@ -119,10 +130,9 @@ class SwiftClass(SwiftObjectDescription):
         if super_classes:
             children = []
             for c in super_classes:
-                prefix = ', ' if c != super_classes[0] else ''
-                ref = addnodes.pending_xref('', reftype='type', refdomain='swift', reftarget=c, refwarn=True)
-                ref += nodes.Text(prefix + c)
-                children.append(ref)
+                if c != super_classes[0]:
+                    children.append(nodes.Text(', '))
+                children.extend(type_xrefs(c, refwarn=True))
             signode += addnodes.desc_type('', ' : ', *children)
 
         # add type constraint
@@ -166,112 +176,13 @@ class SwiftClassmember(SwiftObjectDescription):
               names=('returns', 'return')),
     ]
 
-    def _parse_parameter_list(self, parameter_list):
-        parameters = []
-        parens = {'[]': 0, '()': 0, '<>': 0}
-        last_split = 0
-        for i, c in enumerate(parameter_list):
-            for key, value in list(parens.items()):
-                if c == key[0]:
-                    value += 1
-                    parens[key] = value
-                if c == key[1]:
-                    value -= 1
-                    parens[key] = value
-
-            skip_comma = False
-            for key, value in list(parens.items()):
-                if value != 0:
-                    skip_comma = True
-
-            if c == ',' and not skip_comma:
-                parameters.append(parameter_list[last_split:i].strip())
-                last_split = i + 1
-        parameters.append(parameter_list[last_split:].strip())
-
-        result = []
-        for parameter in parameters:
-            name, rest = [x.strip() for x in parameter.split(':', 1)]
-            name_parts = name.split(' ', 1)
-            if len(name_parts) > 1:
-                name = name_parts[0]
-                variable_name = name_parts[1]
-            else:
-                name = name_parts[0]
-                variable_name = name_parts[0]
-            equals = rest.rfind('=')
-            if equals >= 0:
-                default_value = rest[equals + 1:].strip()
-                param_type = rest[:equals].strip()
-            else:
-                default_value = None
-                param_type = rest
-            result.append({
-                "name": name,
-                "variable_name": variable_name,
-                "type": param_type,
-                "default": default_value
-            })
-        return result
-
     def handle_signature(self, sig, signode):
         container_class_name = self.env.temp_data.get('swift:class')
         container_class_type = self.env.temp_data.get('swift:class_type')
 
-        # split into method name and rest
-        first_anglebracket = sig.find('<')
-        first_paren = sig.find('(')
-        if first_anglebracket >= 0 and first_paren > first_anglebracket:
-            split_point = sig.find('>')+1
-        else:
-            split_point = first_paren
-
-        # calculate generics
-        if first_anglebracket >= 0:
-            sp = sig[first_anglebracket:]
-            np = sp.find('>')
-            generics = sp[:np+1]
-        else:
-            generics = None
-
-        method_name = sig[0:split_point]
-
-        # find method specialization
-        angle_bracket = method_name.find('<')
-        if angle_bracket >= 0:
-            method_name = method_name[:angle_bracket]
-
-        rest = sig[split_point:]
-
-        # split parameter list
-        parameter_list = None
-        depth = 0
-        for i, c in enumerate(rest):
-            if c == '(':
-                depth += 1
-            elif c == ')':
-                depth -= 1
-            if depth == 0:
-                parameter_list = rest[1:i]
-                rest = rest[i + 1:]
-                break
-
-        if parameter_list is not None and len(parameter_list) > 0:
-            parameters = self._parse_parameter_list(parameter_list)
-        else:
-            parameters = []
-
-        # check if it throws
-        throws = rest.find('throws') >= 0
-
-        # check for return type
-        return_type = None
-        arrow = rest.find('->')
-        if arrow >= 0:
-            return_type = rest[arrow + 2:].strip()
+        parsed = parse_signature(self.objtype, sig)
 
         # build signature and add nodes
-        signature = ''
         if self.objtype == 'static_method':
             signode += addnodes.desc_addname("static", "static func ")
         elif self.objtype == 'class_method':
@@ -279,60 +190,37 @@ class SwiftClassmember(SwiftObjectDescription):
         elif self.objtype != 'init':
             signode += addnodes.desc_addname("func", "func ")
 
-        if self.objtype == 'init':
-            signode += addnodes.desc_name('init', 'init')
-            signature += 'init('
-            for p in parameters:
-                if p['name'] == p['variable_name']:
-                    signature += p['name'] + ':'
-                else:
-                    signature += p['name'] + ' ' + p['variable_name'] + ':'
-            signature += ')'
-        else:
-            signode += addnodes.desc_name(method_name, method_name)
-            signature += method_name
-            signature += '('
-            for p in parameters:
-                if p['name'] == p['variable_name']:
-                    signature += p['name'] + ':'
-                else:
-                    signature += p['name'] + ' ' + p['variable_name'] + ':'
-            signature += ')'
-
-        if generics:
-            signode += addnodes.desc_addname(generics,generics)
+        signode += addnodes.desc_name(parsed.name, parsed.name)
+        signature = parsed.selector
+
+        if parsed.generics:
+            signode += addnodes.desc_addname(parsed.generics, parsed.generics)
 
         params = []
         sig = ''
-        for p in parameters:
-            if p['name'] == p['variable_name']:
-                param = p['name'] + ': ' # + p['type']
-                sig += p['name'] + ':'
+        for p in parsed.parameters:
+            if p.name == p.variable_name:
+                param = p.name + ': '
             else:
-                param = p['name'] + ' ' + p['variable_name'] + ':' # + p['type']
-                sig += p['name'] + ' ' + p['variable_name'] + ':'
-            #if p['default']:
-            #    param += ' = ' + p['default']
+                param = p.label
+            sig += p.label
 
             paramNode = addnodes.desc_parameter(param, param)
-            paramXref = addnodes.pending_xref('', refdomain='swift', reftype='type', reftarget=p['type'])
-            paramXref += nodes.Text(p['type'], p['type'])
-            paramNode += paramXref
-            if p['default']:
-                paramNode += nodes.Text(' = ' + p['default'], ' = ' + p['default'])
+            paramNode.extend(type_xrefs(p.type))
+            if p.default:
+                paramNode += nodes.Text(' = ' + p.default, ' = ' + p.default)
             params.append(paramNode)
         signode += addnodes.desc_parameterlist(sig, "", *params)
 
         title = signature
-        if throws:
+        if parsed.throws:
             signode += addnodes.desc_annotation("throws", "throws")
             # signature += "throws"
 
-        if return_type:
+        if parsed.return_type:
+            return_type = parsed.return_type
             paramNode = addnodes.desc_returns('', '')
-            paramXref = addnodes.pending_xref('', refdomain='swift', reftype='type', reftarget=return_type)
-            paramXref += nodes.Text(return_type, return_type)
-            paramNode += paramXref
+            paramNode.extend(type_xrefs(return_type))
             signode += paramNode
             # signode += addnodes.desc_returns(return_type, return_type)
             #signature += "-" + return_type
@@ -429,9 +317,7 @@ class SwiftClassIvar(SwiftObjectDescription):
             # signode += addnodes.desc_type(typ, " : " + typ)
             # Add ref
             typeNode = addnodes.desc_type(' : ', ' : ')
-            typeXref = addnodes.pending_xref('', refdomain='swift', reftype='type', reftarget=typ)
-            typeXref += nodes.Text(typ, typ)
-            typeNode += typeXref
+            typeNode.extend(type_xrefs(typ))
             signode += typeNode
 
 
@@ -463,6 +349,7 @@ class SwiftXRefRole(XRefRole):
 
 
 type_order = ['class', 'struct', 'enum', 'protocol', 'extension']
+type_rank = dict((t, i) for (i, t) in enumerate(type_order))
 
 class SwiftModuleIndex(Index):
     """
@@ -473,67 +360,57 @@ class SwiftModuleIndex(Index):
     localname = _('Swift Module Index')
     shortname = _('Index')
 
-    @staticmethod
-    def indexsorter(a):
-        global type_order
-        for i, t in enumerate(type_order):
-            if a[0].startswith(t):
-                return '{:04d}{}'.format(i, a[0])
-        return a[0]
+    def generate(self, docnames=None):
+        return self.domain.index_content(None), 0
 
-    @staticmethod
-    def sigsorter(a):
-        global type_order
 
-        start = 0
-        for t in type_order:
-            if a[3].startswith(t):
-                start = len(t) + 1
-                break
-        return a[3][start]
+class SwiftKindIndex(Index):
+    """
+    Index of all Swift types of one kind, only generated if the kind is
+    listed in the ``swift_kind_indices`` config value.
+    """
+
+    kind = None
 
     def generate(self, docnames=None):
-        global type_order
-        content = []
-        collapse = 0
-
-        entries = []
-        for refname, (docname, typ, signature) in _iteritems(self.domain.data['objects']):
-            info = typ.replace("_", " ")
-            entries.append((
-                refname,
-                0,
-                docname,
-                signature,
-                info,
-                '',
-                ''
-            ))
-
-        entries = sorted(entries, key=self.sigsorter)
-        current_list = []
-        current_key = None
-        for entry in entries:
-            start = 0
-            for t in type_order:
-                if entry[3].startswith(t):
-                    start = len(t) + 1
-                    break
+        if self.kind not in self.domain.env.config.swift_kind_indices:
+            return [], 0
+        return self.domain.index_content(self.kind), 0
+
 
-            if entry[3][start].upper() != current_key:
-                if len(current_list) > 0:
-                    content.append((current_key, current_list))
-                current_key = entry[3][start].upper()
-                current_list = []
-            current_list.append(entry)
-        content.append((current_key, current_list))
+class SwiftClassIndex(SwiftKindIndex):
+    name = 'classindex'
+    localname = _('Swift Class Index')
+    shortname = _('Classes')
+    kind = 'class'
 
-        result = []
-        for key, entries in content:
-            e = sorted(entries, key=self.indexsorter)
-            result.append((key, e))
 
-        return result, collapse
+class SwiftStructIndex(SwiftKindIndex):
+    name = 'structindex'
+    localname = _('Swift Struct Index')
+    shortname = _('Structs')
+    kind = 'struct'
+
+
+class SwiftEnumIndex(SwiftKindIndex):
+    name = 'enumindex'
+    localname = _('Swift Enum Index')
+    shortname = _('Enums')
+    kind = 'enum'
+
+
+class SwiftProtocolIndex(SwiftKindIndex):
+    name = 'protocolindex'
+    localname = _('Swift Protocol Index')
+    shortname = _('Protocols')
+    kind = 'protocol'
+
+
+class SwiftExtensionIndex(SwiftKindIndex):
+    name = 'extensionindex'
+    localname = _('Swift Extension Index')
+    shortname = _('Extensions')
+    kind = 'extension'
 
 
 class SwiftDomain(Domain):
@@ -598,71 +475,265 @@ class SwiftDomain(Domain):
     }
     initial_data = {
         'objects': {},  # fullname -> docname, objtype
+        'types': {},  # qualified type name -> fullnames, in the order they were added
+        'bare_types': {},  # unqualified type name -> fullnames
+        'docs': {},  # docname -> set of fullnames
+        'initials': {},  # index letter -> type rank -> sorted fullnames
+        'duplicates': {},  # docname -> fullnames warned about as duplicates
     }
+    data_version = 4
     indices = [
         SwiftModuleIndex,
+        SwiftClassIndex,
+        SwiftStructIndex,
+        SwiftEnumIndex,
+        SwiftProtocolIndex,
+        SwiftExtensionIndex,
     ]
 
+    def __init__(self, env):
+        Domain.__init__(self, env)
+        self.index_cache = {}  # kind -> generated index content
+        self.external = None
+        self.inventories = None
+        self.resolved = {}  # (role, target) -> result of `resolve_target`
+        self.resolve_stats = {'hits': 0, 'misses': 0, 'unresolved': 0}
+
+    def external_symbols(self):
+        if self.external is None:
+            self.external = ExternalSymbols(self.env.config.swift_external_symbols)
+        return self.external
+
+    def inventory_tables(self):
+        """Return the lookup tables of the inventories in `swift_inventories`."""
+        if self.inventories is None:
+            self.inventories = []
+            for _name, _uri, _location, filename in inventory_tables(self.env.config, self.env.doctreedir):
+                if os.path.exists(filename):
+                    self.inventories.append(InventoryTable(filename))
+        return self.inventories
+
+    @staticmethod
+    def type_names(fullname):
+        """Return qualified and bare name of a type object (`class Outer.Inner`) or `None`."""
+        typ, _sep, name = fullname.partition(' ')
+        if typ not in type_order or not name:
+            return None
+        return name, name.rsplit('.', 1)[-1]
+
+    @staticmethod
+    def index_keys(fullname, signature):
+        """Return index letter and type rank (members rank last) of an object."""
+        typ, _sep, name = signature.partition(' ')
+        initial = name[0] if typ in type_rank and name else signature[0]
+        typ, _sep, name = fullname.partition(' ')
+        rank = type_rank[typ] if typ in type_rank and name else len(type_order)
+        return initial.upper(), rank
+
+    def add_object(self, fullname, docname, objtype, signature, warn_duplicate=True):
+        if fullname in self.data['objects']:
+            other = self.data['objects'][fullname][0]
+            if warn_duplicate and other != docname:
+                logger.warning('duplicate object description of %s, other instance in %s', fullname, other,
+                               location=(docname, None))
+                self.data['duplicates'].setdefault(docname, set()).add(fullname)
+            self.remove_object(fullname)
+        self.data['objects'][fullname] = (docname, objtype, signature)
+        self.data['docs'].setdefault(docname, set()).add(fullname)
+        initial, rank = self.index_keys(fullname, signature)
+        insort(self.data['initials'].setdefault(initial, {}).setdefault(rank, []), fullname)
+        self.index_cache.clear()
+        self.resolved.clear()
+        names = self.type_names(fullname)
+        if names:
+            self.data['types'].setdefault(names[0], []).append(fullname)
+            self.data['bare_types'].setdefault(names[1], []).append(fullname)
+
+    def remove_object(self, fullname):
+        docname, _objtype, signature = self.data['objects'].pop(fullname)
+        initial, rank = self.index_keys(fullname, signature)
+        ranks = self.data['initials'][initial]
+        fullnames = ranks[rank]
+        del fullnames[bisect_left(fullnames, fullname)]
+        if not fullnames:
+            del ranks[rank]
+            if not ranks:
+                del self.data['initials'][initial]
+        self.index_cache.clear()
+        self.resolved.clear()
+
+        fullnames = self.data['docs'].get(docname)
+        if fullnames is not None:
+            fullnames.discard(fullname)
+            if not fullnames:
+                del self.data['docs'][docname]
+        names = self.type_names(fullname)
+        if names:
+            for key, index in ((names[0], self.data['types']), (names[1], self.data['bare_types'])):
+                fullnames = index[key]
+                fullnames.remove(fullname)
+                if not fullnames:
+                    del index[key]
+
     def clear_doc(self, docname):
-        for fullname, (fn, _, _) in list(self.data['objects'].items()):
-            if fn == docname:
-                del self.data['objects'][fullname]
+        for fullname in list(self.data['docs'].get(docname, ())):
+            self.remove_object(fullname)
+        self.data['duplicates'].pop(docname, None)
+
+    def merge_domaindata(self, docnames, otherdata):
+        for docname in docnames:
+            if docname in otherdata['duplicates']:
+                self.data['duplicates'][docname] = set(otherdata['duplicates'][docname])
+        for fullname, (fn, objtype, signature) in _iteritems(otherdata['objects']):
+            if fn not in docnames:
+                continue
+            # the reader already warned if it knew the other instance
+            warned = fullname in otherdata['duplicates'].get(fn, ())
+            self.add_object(fullname, fn, objtype, signature, warn_duplicate=not warned)
+
+    def index_content(self, kind):
+        """Return the content of the module index (`kind` is `None`) or a per-kind index.
+
+        All indices are generated in one pass over the pre-sorted buckets and
+        cached until an object is added or removed.
+        """
+        if not self.index_cache:
+            objects = self.data['objects']
+            content = dict((t, []) for t in type_order)
+            content[None] = []
+            for initial in sorted(self.data['initials']):
+                ranks = self.data['initials'][initial]
+                entries = []
+                for rank in sorted(ranks):
+                    kind_entries = []
+                    for fullname in ranks[rank]:
+                        docname, typ, signature = objects[fullname]
+                        kind_entries.append((fullname, 0, docname, signature, typ.replace('_', ' '), '', ''))
+                    entries.extend(kind_entries)
+                    if rank < len(type_order):
+                        content[type_order[rank]].append((initial, kind_entries))
+                content[None].append((initial, entries))
+            self.index_cache.update(content)
+        return self.index_cache[kind]
+
+    def find_type(self, target):
+        """Return the fullname of the type object `target` refers to or `None`."""
+        fullnames = self.data['types'].get(target) or self.data['bare_types'].get(target)
+        return fullnames[0] if fullnames else None
+
+    def resolve_target(self, target):
+        """Find what `target` refers to, returns one of
+
+        - `('local', docname, anchor, title)` for objects of this project
+        - `('inventory', uri, title)` for objects in `swift_inventories`
+        - `('symbol', uri, name)` for known framework types
+        - `None` if the target is unknown
+        """
+        # explicit roles refer to the full name (`class Foo`, `Foo.bar()`)
+        if target in self.data['objects']:
+            docname, _objtype, signature = self.data['objects'][target]
+            return 'local', docname, signature, target
+
+        test_target = target
+        fullname = self.find_type(test_target)
+        if fullname is None and '.' in test_target:
+            # module qualified (`Foundation.Date`)
+            test_target = test_target.rsplit('.', 1)[-1]
+            fullname = self.find_type(test_target)
+        if fullname is not None:
+            docname, _objtype, signature = self.data['objects'][fullname]
+            return 'local', docname, signature, test_target
+
+        for table in self.inventory_tables():
+            for name in (target, test_target):
+                uri = table.get(name)
+                if uri is not None:
+                    return 'inventory', uri, name
+
+        uri = self.external_symbols().uri(test_target)
+        if uri is not None:
+            return 'symbol', uri, test_target
+
+        return None
 
     def resolve_xref(self, env, fromdocname, builder,
                      typ, target, node, contnode):
-        if target.endswith('?') or target.endswith('!'):
-            test_target = target[:-1]
-        elif target.startswith('[') and target.endswith(']'):
-            test_target = target[1:-1]
+        if target not in self.data['objects']:
+            if target.endswith('?') or target.endswith('!'):
+                target = target[:-1]
+            elif target.startswith('[') and target.endswith(']'):
+                target = target[1:-1]
+
+        key = (typ, target)
+        if key in self.resolved:
+            self.resolve_stats['hits'] += 1
+            result = self.resolved[key]
         else:
-            test_target = target
-
-        point_pos = test_target.find('.')
-        if point_pos != -1:
-            test_target = test_target[point_pos:]
-
-        for refname, (docname, type, signature) in _iteritems(self.data['objects']):
-            for to in type_order:
-                if refname == to + ' ' + test_target:
-                    node = make_refnode(builder, fromdocname, docname, signature, contnode, test_target)
-                    return node
-        if test_target in swift_reserved:
-            node = nodes.reference(test_target, test_target)
-            if test_target.startswith('CG'):
-                node['refuri'] = 'https://developer.apple.com/documentation/coregraphics/' + test_target.lower()
-            elif test_target.startswith('CL'):
-                node['refuri'] = 'https://developer.apple.com/documentation/corelocation/' + test_target.lower()
-            elif test_target.startswith('GL'):
-                node['refuri'] = 'https://developer.apple.com/documentation/glkit/' + test_target.lower()
-            elif test_target.startswith('UI'):
-                node['refuri'] = 'https://developer.apple.com/documentation/uikit/' + test_target.lower()
-            else:
-                node['refuri'] = 'https://developer.apple.com/documentation/swift/' + test_target.lower()
-            node['reftitle'] = test_target
-
+            self.resolve_stats['misses'] += 1
+            result = self.resolved[key] = self.resolve_target(target)
+
+        if result is None:
+            self.resolve_stats['unresolved'] += 1
+            return None
+        if result[0] == 'local':
+            _kind, docname, anchor, title = result
+            return make_refnode(builder, fromdocname, docname, anchor, contnode, title)
+        if result[0] == 'inventory':
+            node = nodes.reference('', '', internal=False, refuri=result[1], reftitle=result[2])
+            node += contnode
             return node
 
-        return None
+        _kind, uri, name = result
+        node = nodes.reference(name, name)
+        node['refuri'] = uri
+        node['reftitle'] = name
+        return node
 
     def get_objects(self):
         for refname, (docname, type, signature) in _iteritems(self.data['objects']):
-            yield (refname, refname, type, docname, refname, 1)
+            yield (refname, refname, type, docname, signature, 1)
+
+def report_resolve_stats(app, exception):
+    stats = app.env.get_domain('swift').resolve_stats
+    if exception is None and stats['misses']:
+        logger.info('Swift cross-references: %d cache hits, %d misses, %d unresolved',
+                    stats['hits'], stats['misses'], stats['unresolved'])
 
 def make_index(app,*args):
     from .autodoc import build_index
     build_index(app)
 
 def setup(app):
-    # from .autodoc import SwiftAutoDocumenter, ProtocolAutoDocumenter, ExtensionAutoDocumenter, EnumAutoDocumenter
-    # app.connect('builder-inited', make_index)
+    from .autodoc import SwiftAutoDocumenter, ProtocolAutoDocumenter, ExtensionAutoDocumenter, EnumAutoDocumenter
+    from .autodoc import purge_rst_cache, merge_rst_cache, save_rst_cache
+    app.connect('builder-inited', make_index)
+    app.connect('env-purge-doc', purge_rst_cache)
+    app.connect('env-merge-info', merge_rst_cache)
+    app.connect('env-updated', save_rst_cache)
 
 #    app.override_domain(SwiftStandardDomain)
-   # app.add_autodocumenter(SwiftAutoDocumenter)
-   # app.add_autodocumenter(ProtocolAutoDocumenter)
-   # app.add_autodocumenter(ExtensionAutoDocumenter)
-   # app.add_autodocumenter(EnumAutoDocumenter)
+    app.setup_extension('sphinx.ext.autodoc')
+    app.add_autodocumenter(SwiftAutoDocumenter)
+    app.add_autodocumenter(ProtocolAutoDocumenter)
+    app.add_autodocumenter(ExtensionAutoDocumenter)
+    app.add_autodocumenter(EnumAutoDocumenter)
 
 
     app.add_domain(SwiftDomain)
     app.add_config_value('swift_search_path', ['../src'], 'env')
+    app.add_config_value('swift_index_cache', None, 'env')
+    app.add_config_value('swift_index_jobs', 1, 'env')
+    app.add_config_value('swift_include_patterns', ['*.swift'], 'env')
+    app.add_config_value('swift_exclude_patterns', default_exclude_patterns, 'env')
+    app.add_config_value('swift_kind_indices', [], 'html')
+    app.add_config_value('swift_external_symbols', {}, 'html')
+    app.add_config_value('swift_inventories', {}, 'html')
+    app.add_config_value('swift_inventory_cache_limit', 5, 'html')
+    app.connect('builder-inited', update_inventories)
+    app.connect('build-finished', report_resolve_stats)
 #    app.add_config_value('autodoc_default_flags', [], True)
+
+    return {
+        'parallel_read_safe': True,
+        'parallel_write_safe': True,
+    }
@@ -0,0 +1,7 @@
+import os
+
+extensions = ['swift_domain']
+master_doc = 'index'
+project = 'parallel'
+swift_search_path = [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')]
+swift_index_cache = False
@@ -0,0 +1,55 @@
+/// Something to draw on.
+public class Canvas {
+    /// Shapes drawn so far.
+    public var shapes: [Shape]
+
+    /// Add a shape.
+    ///
+    /// - Parameter shape: the shape to add
+    /// - Returns: the number of shapes
+    public func add(shape: Shape) -> Int {
+        return 0
+    }
+}
+
+/// Colors of a canvas.
+public enum Color {
+    /// Red.
+    case red
+
+    /// A gray level.
+    case gray(Double)
+}
+
+/// Formatting of a canvas.
+extension Canvas: CustomStringConvertible {
+    /// Description of the canvas.
+    public var description: String {
+        return ""
+    }
+}
+
+/// A layer of a canvas.
+public struct Layer {
+    /// Canvas of the layer.
+    public var canvas: Canvas
+
+    /// Color of the layer.
+    public var color: Color?
+}
+
+/// A point on a canvas.
+public struct Point {
+    /// Horizontal position.
+    public var x: Double
+
+    /// Vertical position.
+    public var y: Double
+
+    /// Distance to another point.
+    ///
+    /// - Parameter other: the other point
+    public func distance(to other: Point) -> Double {
+        return 0
+    }
+}
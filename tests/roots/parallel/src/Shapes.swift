@@ -0,0 +1,40 @@
+/// A shape that can be drawn.
+public protocol Shape {
+    /// Area of the shape.
+    var area: Double { get }
+
+    /// Draw the shape.
+    ///
+    /// - Parameter canvas: where to draw
+    func draw(canvas: Canvas)
+}
+
+/// A circle.
+public class Circle: Shape {
+    /// Radius of the circle.
+    public var radius: Double
+
+    /// Create a circle.
+    ///
+    /// - Parameter radius: the radius
+    public init(radius: Double) {
+        self.radius = radius
+    }
+
+    /// Draw the circle.
+    public func draw(canvas: Canvas) {
+    }
+}
+
+/// A rectangle.
+public struct Rectangle: Shape {
+    /// Width of the rectangle.
+    public let width: Double
+
+    /// Height of the rectangle.
+    public let height: Double
+
+    /// Draw the rectangle.
+    public func draw(canvas: Canvas) {
+    }
+}
@@ -0,0 +1,84 @@
+import pytest
+
+pytest.importorskip('sphinx')
+
+from sphinx.ext.autodoc import ALL, Options
+
+from swift_domain.autodoc import MemberFilter, members_set_option
+
+
+class Members(object):
+    def __init__(self, members):
+        self.index = members
+
+
+def member(name, raw):
+    return {'name': name, 'raw': raw}
+
+
+MEMBERS = [
+    member('init', '    public init?(value: Int) {\n'),
+    member('subscript', '    public func subscript(index: [Int]) -> Int {\n'),
+    member('map', '    func map<T>(_ transform: (Element) -> T) -> [T] {\n'),
+    member('count', '    var count: Int\n'),
+    member('a.b', '    let axb = 1\n'),
+]
+TYPE = {'members': Members(MEMBERS)}
+
+
+def options(**kwargs):
+    # like the directive options, `exclude_members` reads `exclude-members`
+    return Options((key.replace('_', '-'), value) for key, value in kwargs.items())
+
+
+def selected(**kwargs):
+    member_filter = MemberFilter(options(**kwargs))
+    return [x['name'] for x in MEMBERS if member_filter.selects_member(x)]
+
+
+def test_members_set_option():
+    assert members_set_option(None) is ALL
+    assert members_set_option('a, b ,c') == {'a', 'b', 'c'}
+
+
+def test_all_members():
+    assert selected() == ['init', 'subscript', 'map', 'count', 'a.b']
+    assert selected(members=ALL) == ['init', 'subscript', 'map', 'count', 'a.b']
+
+
+def test_members():
+    assert selected(members=['map', 'count']) == ['map', 'count']
+
+
+def test_exclude_members():
+    assert selected(exclude_members={'init', 'a.b'}) == ['subscript', 'map', 'count']
+    assert selected(members=['map', 'count'], exclude_members={'count'}) == ['map']
+
+
+def test_raw_members():
+    assert selected(raw_members={'var '}) == ['count']
+    assert selected(raw_members={'init?(', '[Int]'}) == ['init', 'subscript']
+    # `/` stands for a comma
+    assert selected(raw_members={'(_ transform: (Element) -> T) -> [T]', 'map<T>(_ transform/'}) == ['map']
+    # patterns are literal, `.` and `*` match only themselves
+    assert selected(raw_members={'a.b', 'Int*'}) == []
+    assert selected(raw_members={'axb'}) == ['a.b']
+
+
+def test_raw_members_combined():
+    assert selected(members=['count'], raw_members={'init?'}) == ['init', 'count']
+    assert selected(raw_members={'public'}, exclude_members={'init'}) == ['subscript']
+
+
+def test_only_with_members():
+    assert MemberFilter(options(only_with_members={'count'})).selects_type(TYPE)
+    assert MemberFilter(options(only_with_members={'a.b', 'missing'})).selects_type(TYPE)
+    assert not MemberFilter(options(only_with_members={'a*b', 'coun'})).selects_type(TYPE)
+
+
+def test_only_with_raw_members():
+    assert MemberFilter(options(only_with_raw_members={'[Int]'})).selects_type(TYPE)
+    assert MemberFilter(options(only_with_raw_members={'-> [T]'})).selects_type(TYPE)
+    assert not MemberFilter(options(only_with_raw_members={'[Int]?', 'a.b'})).selects_type(TYPE)
+    assert not MemberFilter(options(only_with_members={'count'},
+                                    only_with_raw_members={'missing'})).selects_type(TYPE)
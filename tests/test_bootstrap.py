@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+from swift_domain.bootstrap import main
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roots', 'parallel', 'src')
+
+
+def read_tree(directory):
+    result = {}
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, encoding='utf-8') as fp:
+                result[os.path.relpath(path, directory)] = fp.read()
+    return result
+
+
+def test_jobs(tmp_path):
+    main([SOURCE, str(tmp_path / 'serial')])
+    main(['--jobs', '2', SOURCE, str(tmp_path / 'parallel')])
+
+    serial = read_tree(str(tmp_path / 'serial'))
+    assert sorted(serial) == ['Canvas.rst', 'Shapes.rst']
+    assert '.. swift:class:: Circle' in serial['Shapes.rst']
+    assert read_tree(str(tmp_path / 'parallel')) == serial
+
+
+def test_cache(tmp_path, capsys):
+    cache = str(tmp_path / 'swift-index.cache')
+    main(['--jobs', '2', '--cache', cache, SOURCE, str(tmp_path / 'first')])
+    assert os.path.exists(cache)
+    assert 'Indexed 2 files' in capsys.readouterr().out
+
+    # nothing is parsed again
+    main(['--jobs', '2', '--cache', cache, SOURCE, str(tmp_path / 'second')])
+    assert 'Indexed' not in capsys.readouterr().out
+    assert read_tree(str(tmp_path / 'second')) == read_tree(str(tmp_path / 'first'))
+
+
+def test_exclude_path(tmp_path):
+    main(['--jobs', '2', '--exclude-path', 'Canvas.swift', SOURCE, str(tmp_path / 'out')])
+    assert sorted(read_tree(str(tmp_path / 'out'))) == ['Shapes.rst']
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_write_error(tmp_path, jobs):
+    # a directory in place of an output file can not be written
+    os.makedirs(str(tmp_path / 'out' / 'Canvas.rst'))
+    with pytest.raises(IsADirectoryError):
+        main(['--jobs', jobs, '--overwrite', SOURCE, str(tmp_path / 'out')])
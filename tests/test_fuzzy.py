@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip('sphinx')
+
+from swift_domain.fuzzy import FuzzyMatcher
+
+
+def test_typo():
+    matcher = FuzzyMatcher(['Foo', 'Bar.Baz', 'Bar.Qux'])
+    assert matcher.best('Bar.Bax')[0] == 'Bar.Baz'
+    assert matcher.best('Baz')[0] == 'Bar.Baz'
+
+
+def test_no_names():
+    assert FuzzyMatcher([]).best('Foo') is None
+
+
+def test_no_shared_trigram():
+    assert FuzzyMatcher(['Foo', 'Bar.Baz']).best('Xyz') == ('Bar.Baz', 30)
+
+
+def test_only_frequent_trigrams():
+    names = ['View%04d' % i for i in range(6000)]
+    matcher = FuzzyMatcher(names + ['Window'])
+    for query in ('View', 'Viwe'):
+        best = matcher.best(query)
+        assert best is not None
+        assert best[0].startswith('View')
@@ -0,0 +1,125 @@
+import os
+import pickle
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+from swift_domain.cache import SwiftIndexCache
+from swift_domain.indexer import PARSER_VERSION, DocComments, SwiftFileIndex, discover_files
+
+
+def comments(source):
+    return DocComments([l + '\n' for l in source.split('\n')])
+
+
+def test_doc_block_comment():
+    doc = comments('/**\n Documented\n */\nclass Foo {}')
+    assert doc.block(2) == ['', ' Documented', ' ']
+
+
+def test_indented_plain_comment_is_no_docstring():
+    doc = comments(
+        'class Foo {\n'
+        '    /** documented */\n'
+        '    func documented() {}\n'
+        '    let value = 1\n'
+        '    /* plain */\n'
+        '    func plain() {}\n'
+        '}'
+    )
+    assert doc.block(1) == [' documented']
+    assert doc.span(4) is None
+    assert doc.block(4) == []
+
+
+def test_indented_plain_block_comment_is_no_docstring():
+    doc = comments(
+        '    /** documented */\n'
+        '    func documented() {}\n'
+        '    /*\n'
+        '     plain\n'
+        '     */\n'
+        '    func plain() {}'
+    )
+    assert doc.span(4) is None
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('')
+
+
+def test_discover_files_relative_patterns(tmp_path):
+    for name in ('Top.swift', 'Sub/A.swift', 'Sub/Deep/B.swift', 'Other/C.swift', 'Other/Skip/D.swift'):
+        touch(tmp_path / name)
+    found = lambda **kwargs: [os.path.relpath(f, str(tmp_path)) for f in discover_files([str(tmp_path)], **kwargs)]
+
+    assert found() == ['Top.swift', 'Other/C.swift', 'Other/Skip/D.swift', 'Sub/A.swift', 'Sub/Deep/B.swift']
+    assert found(include_patterns=['Sub/*.swift']) == ['Sub/A.swift', 'Sub/Deep/B.swift']
+    assert found(include_patterns=['Top.swift']) == ['Top.swift']
+    assert found(exclude_patterns=['Other/Skip', 'Deep']) == ['Top.swift', 'Other/C.swift', 'Sub/A.swift']
+
+
+def test_index_cache_invalidation(tmp_path):
+    source = tmp_path / 'Foo.swift'
+    source.write_text('class Foo {}\n')
+    path = str(tmp_path / 'index.cache')
+    cache = SwiftIndexCache(path, 1)
+    cache.put(str(source), ['symbols'])
+    cache.save()
+
+    # touched but not modified
+    stat = os.stat(str(source))
+    os.utime(str(source), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert SwiftIndexCache(path, 1).get(str(source)) == ['symbols']
+
+    # same size, other content
+    source.write_text('class Bar {}\n')
+    os.utime(str(source), ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+    assert SwiftIndexCache(path, 1).get(str(source)) is None
+
+    # other size
+    cache = SwiftIndexCache(path, 1)
+    cache.put(str(source), ['symbols'])
+    cache.save()
+    source.write_text('class Foobar {}\n')
+    assert SwiftIndexCache(path, 1).get(str(source)) is None
+
+    # other parser version
+    cache = SwiftIndexCache(path, 1)
+    cache.put(str(source), ['symbols'])
+    cache.save()
+    assert SwiftIndexCache(path, 1).get(str(source)) == ['symbols']
+    assert SwiftIndexCache(path, 2).get(str(source)) is None
+
+
+def test_index_cache_picks_up_changes(tmp_path):
+    source = tmp_path / 'src' / 'Foo.swift'
+    source.parent.mkdir()
+    source.write_text('/// Old docs\nclass Foo {}\n')
+    path = str(tmp_path / 'index.cache')
+    index = lambda: SwiftFileIndex([str(source.parent)], cache_path=path, progress=lambda file: None)
+
+    assert index().find('Foo')[0]['docstring'] == (' Old docs',)
+    source.write_text('/// New documentation\nclass Foo {}\n')
+    assert index().find('Foo')[0]['docstring'] == (' New documentation',)
+
+    with open(path, 'rb') as fp:
+        assert pickle.load(fp)[0] == PARSER_VERSION
+
+
+def test_unpickled_records_share_strings(tmp_path):
+    source = tmp_path / 'Foo.swift'
+    source.write_text('/// Docs\nclass Foo {\n    /// Docs\n    func bar() {}\n}\n')
+    symbol = SwiftFileIndex.parse_file(str(source))[0]
+
+    # like results of a worker process, every record in its own pickle
+    copy = pickle.loads(pickle.dumps(symbol))
+    member = pickle.loads(pickle.dumps(symbol['members'].index[0]))
+    assert copy['name'] == 'Foo' and member['name'] == 'bar'
+    assert copy['file'] is symbol['file'] is member['file'] is copy['members'].file
+    assert copy['type'] is symbol['type']
+    assert member['doc_kind'] is copy['doc_kind']
+    assert copy['members'].index[0]['name'] is member['name']
+    assert copy['docstring'] == symbol['docstring']
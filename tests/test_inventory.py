@@ -0,0 +1,44 @@
+import io
+import os
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+from sphinx.application import Sphinx
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roots', 'parallel')
+
+
+def build(srcdir, outdir):
+    status = io.StringIO()
+    warnings = io.StringIO()
+    app = Sphinx(srcdir, srcdir, os.path.join(outdir, 'html'), os.path.join(outdir, 'doctrees'), 'html',
+                 status=status, warning=warnings, freshenv=True)
+    app.build()
+    return app, status.getvalue(), warnings.getvalue()
+
+
+def test_inventories(tmp_path):
+    build(ROOT, str(tmp_path / 'shapes'))
+
+    srcdir = tmp_path / 'docs'
+    srcdir.mkdir()
+    (srcdir / 'conf.py').write_text(
+        "extensions = ['swift_domain']\n"
+        "master_doc = 'index'\n"
+        "swift_search_path = []\n"
+        "swift_index_cache = False\n"
+        "swift_inventories = {\n"
+        "    'shapes': ('https://shapes.example.com/', %r),\n"
+        "    'missing': ('https://missing.example.com/', 'missing.inv'),\n"
+        "}\n" % str(tmp_path / 'shapes' / 'html' / 'objects.inv'))
+    (srcdir / 'index.rst').write_text('Index\n=====\n\nA :swift:class:`Circle` on a :swift:class:`Canvas`.\n')
+
+    app, status, warnings = build(str(srcdir), str(tmp_path / 'docs-out'))
+    assert 'loading Swift inventory shapes from' in status
+    assert 'Swift inventory missing not fetchable due to' in warnings
+    with open(str(tmp_path / 'docs-out' / 'html' / 'index.html'), encoding='utf-8') as fp:
+        html = fp.read()
+    assert 'href="https://shapes.example.com/circle.html#class Circle"' in html
+    assert 'href="https://shapes.example.com/canvas.html#class Canvas"' in html
@@ -0,0 +1,127 @@
+import io
+import multiprocessing
+import os
+import re
+import shutil
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+from sphinx.application import Sphinx
+
+from swift_domain.cache import RstCache
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roots', 'parallel')
+
+
+def build(srcdir, outdir, jobs):
+    warnings = io.StringIO()
+    app = Sphinx(srcdir, srcdir, os.path.join(outdir, 'html'), os.path.join(outdir, 'doctrees'), 'html',
+                 status=io.StringIO(), warning=warnings, freshenv=True, parallel=jobs)
+    app.build()
+    return app, warnings.getvalue()
+
+
+def html_files(outdir):
+    result = {}
+    for name in sorted(os.listdir(os.path.join(outdir, 'html'))):
+        if name.endswith('.html'):
+            with open(os.path.join(outdir, 'html', name), encoding='utf-8') as fp:
+                result[name] = fp.read()
+    return result
+
+
+def test_parallel_build_is_identical(tmp_path):
+    serial, serial_warnings = build(ROOT, str(tmp_path / 'serial'), 1)
+    parallel, parallel_warnings = build(ROOT, str(tmp_path / 'parallel'), 4)
+
+    assert parallel.parallel == 4
+    assert 'duplicate' not in serial_warnings + parallel_warnings
+    objects = serial.env.get_domain('swift').data['objects']
+    assert 'class Circle' in objects
+    assert parallel.env.get_domain('swift').data['objects'] == objects
+
+    serial_html = html_files(str(tmp_path / 'serial'))
+    assert len(serial_html) > 8
+    assert html_files(str(tmp_path / 'parallel')) == serial_html
+    for signature in ('class Circle', 'struct Rectangle', 'protocol Shape', 'enum Color'):
+        assert 'href="%s.html#%s"' % (signature.split()[1].lower(), signature) in serial_html['references.html']
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_duplicate_warning(tmp_path, jobs):
+    srcdir = str(tmp_path / 'src')
+    shutil.copytree(ROOT, srcdir)
+    # in parallel builds zcircle.rst is read in another chunk than circle.rst
+    with open(os.path.join(srcdir, 'zcircle.rst'), 'w') as fp:
+        fp.write('Circle again\n============\n\n.. swift:class:: Circle\n')
+
+    app, warnings = build(srcdir, str(tmp_path / 'out'), jobs)
+    assert warnings.count('duplicate object description') == 1
+    # chunks are merged in the order the readers finish
+    assert re.search(r'/zcircle\.rst: WARNING: duplicate object description of class Circle, '
+                     r'other instance in circle\b|/circle\.rst: WARNING: duplicate object description '
+                     r'of class Circle, other instance in zcircle\b', warnings)
+
+
+def start_method():
+    return multiprocessing.get_start_method(allow_none=True) or multiprocessing.get_context().get_start_method()
+
+
+@pytest.mark.skipif(start_method() != 'fork', reason='readers are not forked')
+def test_forked_readers_need_no_snapshot(tmp_path):
+    app, warnings = build(ROOT, str(tmp_path), 4)
+    assert app.env.swift_file_index.path is None
+    assert not os.path.exists(str(tmp_path / 'doctrees' / 'swift-index.pickle'))
+
+
+def test_resolve_stats_are_reported(tmp_path):
+    status = io.StringIO()
+    app = Sphinx(ROOT, ROOT, str(tmp_path / 'html'), str(tmp_path / 'doctrees'), 'html',
+                 status=status, warning=io.StringIO(), freshenv=True)
+    app.build()
+    stats = app.env.get_domain('swift').resolve_stats
+    assert stats['misses'] > 0
+    assert 'Swift cross-references: %d cache hits, %d misses, %d unresolved' % (
+        stats['hits'], stats['misses'], stats['unresolved']) in status.getvalue()
+
+
+def test_rst_cache(tmp_path):
+    srcdir = str(tmp_path / 'src')
+    shutil.copytree(ROOT, srcdir)
+    cache_path = str(tmp_path / 'swift-index.cache')
+
+    def build_again(jobs):
+        app = Sphinx(srcdir, srcdir, str(tmp_path / 'html'), str(tmp_path / 'doctrees'), 'html',
+                     status=io.StringIO(), warning=io.StringIO(), parallel=jobs,
+                     confoverrides={'swift_index_cache': cache_path})
+        app.build()
+        with open(str(tmp_path / 'html' / 'circle.html'), encoding='utf-8') as fp:
+            html = fp.read()
+        return RstCache(str(tmp_path / 'swift-index-rst.cache'), app.env.swift_rst_cache.version), html
+
+    # parallel readers send back what they generated
+    cache, html = build_again(4)
+    assert 'A circle.' in html
+    assert set(cache.docs) == {'shape', 'circle', 'rectangle', 'canvas', 'color', 'point', 'layer'}
+    entries = dict(cache.entries)
+    docs = dict(cache.docs)
+    assert any('A circle.' in '\n'.join(lines) for lines in entries.values())
+
+    shapes = os.path.join(srcdir, 'src', 'Shapes.swift')
+    with open(shapes, encoding='utf-8') as fp:
+        source = fp.read()
+    with open(shapes, 'w', encoding='utf-8') as fp:
+        fp.write(source.replace('/// A circle.', '/// A round circle.'))
+    stat = os.stat(shapes)
+    os.utime(shapes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    cache, html = build_again(4)
+    assert 'A round circle.' in html and 'A circle.' not in html
+    # the purged entry is dropped, all others are kept
+    changed = set(entries) - set(cache.entries)
+    assert [entries[key] for key in changed] == [x for x in entries.values() if 'A circle.' in '\n'.join(x)]
+    assert len(cache.entries) == len(entries)
+    assert cache.docs['canvas'] == docs['canvas']
+    assert cache.docs['circle'] != docs['circle']
@@ -0,0 +1,42 @@
+import glob
+import os
+
+import pytest
+
+pytest.importorskip('sphinx')
+
+from swift_domain.indexer import RstConverter, doc_block_to_rst
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as fp:
+        return fp.read().splitlines()
+
+
+@pytest.mark.parametrize('source', sorted(glob.glob(os.path.join(GOLDEN, '*.md'))),
+                         ids=lambda path: os.path.basename(path)[:-3])
+def test_golden(source):
+    """`<name>.md` holds a doc block, `<name>.rst` the reStructuredText it converts to."""
+    with open(source[:-3] + '.rst', encoding='utf-8') as fp:
+        expected = fp.read()
+    assert ''.join(l + '\n' for l in doc_block_to_rst(read_lines(source))) == expected
+
+
+def test_interleaved_conversions():
+    blocks = [read_lines(path) for path in sorted(glob.glob(os.path.join(GOLDEN, '*.md')))]
+    expected = [list(doc_block_to_rst(block)) for block in blocks]
+
+    # advance all converters in turns, none may see the state of another
+    generators = [RstConverter().convert(block) for block in blocks]
+    results = [[] for _ in blocks]
+    done = False
+    while not done:
+        done = True
+        for generator, result in zip(generators, results):
+            line = next(generator, None)
+            if line is not None:
+                result.append(line)
+                done = False
+    assert results == expected